@@ -0,0 +1,85 @@
+# benchmarks/bench_members.py
+# Memory cost of each MEMBER_CACHE profile. Builds synthetic guilds through
+# discord.py's own Guild/Member constructors in a fresh subprocess per
+# profile and reports the RSS growth per 10k members in those guilds.
+#
+#   python benchmarks/bench_members.py --guilds 50 --members 2000
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import gc, json, random, sys
+import discord
+from discord.ext import commands
+from utils.loader import rss_bytes
+from utils.members import MemberLRU, member_cache_options
+
+profile, guilds, per_guild, used, lru_size = sys.argv[1], int(sys.argv[2]), int(sys.argv[3]), float(sys.argv[4]), int(sys.argv[5])
+intents = discord.Intents.default()
+intents.members = True
+bot = commands.Bot(command_prefix="-", intents=intents, **member_cache_options(profile))
+state = bot._connection
+rng = random.Random(1)
+
+def member_payload(uid):
+    return {"user": {"id": str(uid), "username": f"user{uid}", "discriminator": "0", "global_name": f"User {uid}",
+                     "avatar": "a" * 32},
+            "roles": [str(1000 + rng.randrange(20)) for _ in range(rng.randrange(4))],
+            "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0}
+
+gc.collect()
+before = rss_bytes()
+kept = []
+lru = MemberLRU(lru_size) if profile == "lru" else None
+next_id = 10**17
+for g in range(guilds):
+    guild = discord.Guild(data={"id": str(g + 1), "name": f"guild {g}", "member_count": per_guild, "roles": []}, state=state)
+    state._add_guild(guild)
+    chunked = profile == "full" or (profile == "lazy" and rng.random() < used)
+    for _ in range(per_guild):
+        next_id += 1
+        if chunked:
+            guild._add_member(discord.Member(data=member_payload(next_id), guild=guild, state=state))
+        elif lru is not None and rng.random() < used:
+            # members seen through messages/commands land in the LRU
+            lru.put(discord.Member(data=member_payload(next_id), guild=guild, state=state))
+gc.collect()
+after = rss_bytes()
+cached = sum(len(g.members) for g in state.guilds) + (len(lru) if lru is not None else 0)
+print(json.dumps({"rss": after - before, "cached": cached}))
+"""
+
+
+def run(profile, args):
+    out = subprocess.run(
+        [sys.executable, "-c", CHILD, profile, str(args.guilds), str(args.members), str(args.used), str(args.lru_size)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--members", type=int, default=2000, help="members per guild")
+    parser.add_argument("--used", type=float, default=0.1,
+                        help="share of guilds used (lazy) / members seen (lru)")
+    parser.add_argument("--lru-size", type=int, default=5000)
+    args = parser.parse_args()
+
+    population = args.guilds * args.members
+    print(f"{args.guilds} guilds x {args.members} members = {population} members")
+    print(f"{'profile':<8}{'cached':>10}{'RSS MB':>10}{'MB/10k':>10}")
+    for profile in ("full", "lazy", "lru"):
+        r = run(profile, args)
+        mb = r["rss"] / 2**20
+        print(f"{profile:<8}{r['cached']:>10}{mb:>10.1f}{mb / population * 10_000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
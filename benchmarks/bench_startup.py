@@ -0,0 +1,71 @@
+# benchmarks/bench_startup.py
+# Cold-start time from interpreter launch to "all cogs loaded", measured in
+# fresh subprocesses (no gateway connection is made). "baseline" is the old
+# cold start, which imported geopy and timezonefinder eagerly when the misc
+# cog loaded; "lazy" is the current one, which defers them to the first
+# -time lookup the gazetteer can't answer.
+#
+#   python benchmarks/bench_startup.py --runs 5
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = r"""
+import time
+t0 = time.perf_counter()
+import asyncio, sys
+import discord
+from discord.ext import commands
+from utils.loader import format_report, load_cogs
+
+async def main(mode):
+    if mode == "baseline":
+        # what the old cogs/misc.py imported at module level
+        from geopy.geocoders import Nominatim
+        from timezonefinder import TimezoneFinder
+    intents = discord.Intents.default()
+    intents.message_content = True
+    intents.members = True
+    bot = commands.Bot(command_prefix="-", intents=intents, help_command=None)
+    async with bot:
+        timings = await load_cogs(bot, "cogs")
+        elapsed = time.perf_counter() - t0
+        for name in list(bot.extensions):
+            await bot.unload_extension(name)
+    return elapsed, timings
+
+elapsed, timings = asyncio.run(main(sys.argv[1]))
+if "--report" in sys.argv:
+    print(format_report(timings), file=sys.stderr)
+print(f"{elapsed:.6f}")
+"""
+
+
+def run(mode, report=False):
+    env = dict(os.environ, DATA_DIR=tempfile.mkdtemp())
+    args = [sys.executable, "-c", CHILD, mode] + (["--report"] if report else [])
+    out = subprocess.run(args, cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    if report:
+        print(out.stderr.strip())
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    run("lazy", report=True)  # also warms the OS file cache
+    for mode in ("baseline", "lazy"):
+        samples = [run(mode) for _ in range(args.runs)]
+        print(f"{mode:<9} median={statistics.median(samples) * 1000:8.1f}ms  "
+              f"min={min(samples) * 1000:8.1f}ms  max={max(samples) * 1000:8.1f}ms  (n={args.runs})")
+
+
+if __name__ == "__main__":
+    main()
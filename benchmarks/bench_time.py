@@ -0,0 +1,161 @@
+# benchmarks/bench_time.py
+# p50/p99 latency of the -time lookup paths.
+#
+#   python benchmarks/bench_time.py            # offline only: Nominatim is replaced by a stub
+#   python benchmarks/bench_time.py --remote   # also hit Nominatim (network, ~1 req/s)
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.gazetteer import Gazetteer
+from utils.geo import LocationResolver
+
+# all of these are answered by the gazetteer without fuzzy matching
+QUERIES = ["Tokyo", "brazil", "Chennai", "new york", "London", "sao paulo", "Berlin",
+           "san fran", "sydney", "Los Angeles", "india", "UK", "toronto", "Dubai", "Paris"]
+# typos only match fuzzily, which resolve() tries after Nominatim misses
+TYPOS = ["Sydny", "Torronto", "Chenai", "Berln", "Londn"]
+# not in the gazetteer: these always go to the geocoder
+MISSES = ["Hobart", "Kalamazoo", "Bergen"]
+
+StubLocation = namedtuple("StubLocation", "address latitude longitude")
+
+
+class StubGeocoder:
+    """Stands in for Nominatim: sleeps `latency` seconds per call, then
+    answers from the gazetteer (or a fixed point for places it lacks)."""
+
+    def __init__(self, latency):
+        self.latency = latency
+        self.calls = 0
+        self._places = Gazetteer()
+
+    def geocode(self, query):
+        self.calls += 1
+        time.sleep(self.latency)
+        hit = self._places.lookup(query)
+        if hit is None:
+            return StubLocation(query.title(), 42.2917, -85.5872)
+        return StubLocation(hit[0], hit[1], hit[2])
+
+
+def report(label, samples):
+    samples = sorted(samples)
+    p50 = statistics.median(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{label:<28} n={len(samples):<6} p50={p50 * 1000:9.3f}ms  p99={p99 * 1000:9.3f}ms")
+
+
+async def bench_gazetteer(rounds):
+    resolver = LocationResolver(gazetteer=Gazetteer())
+    resolver._geolocator = stub = StubGeocoder(0.0)  # a miss must never reach the network
+    start = time.perf_counter()
+    await resolver.resolve("Tokyo")
+    print(f"gazetteer cold load: {(time.perf_counter() - start) * 1000:.2f}ms ({len(resolver.gazetteer)} keys)")
+    samples = []
+    for _ in range(rounds):
+        for q in QUERIES:
+            t = time.perf_counter()
+            await resolver.resolve(q)
+            samples.append(time.perf_counter() - t)
+    report("gazetteer", samples)
+    if stub.calls:
+        print(f"⚠️ {stub.calls} queries fell through to the geocoder")
+
+
+def bench_fuzzy(rounds):
+    gazetteer = Gazetteer()
+    gazetteer.load()
+    samples = []
+    for _ in range(rounds):
+        for q in TYPOS:
+            t = time.perf_counter()
+            gazetteer.lookup(q, fuzzy=True)
+            samples.append(time.perf_counter() - t)
+    report("gazetteer fuzzy lookup", samples)
+
+
+async def bench_stubbed(rounds, latency):
+    # the same queries through the new resolver and the old command's path,
+    # with Nominatim replaced by a stub that costs `latency` per call
+    from timezonefinder import TimezoneFinder
+    queries = QUERIES + TYPOS + MISSES
+
+    resolver = LocationResolver(gazetteer=Gazetteer())
+    resolver._geolocator = stub = StubGeocoder(latency)
+    samples = []
+    for _ in range(rounds):
+        for q in queries:
+            t = time.perf_counter()
+            await resolver.resolve(q)
+            samples.append(time.perf_counter() - t)
+    report("resolver (stub geocoder)", samples)
+    print(f"  geocoder calls: {stub.calls}")
+
+    stub = StubGeocoder(latency)
+    samples = []
+    for _ in range(rounds):
+        for q in queries:
+            t = time.perf_counter()
+            # the old command: geocode every query, a new TimezoneFinder each call
+            loc = stub.geocode(q)
+            if loc:
+                TimezoneFinder().timezone_at(lat=loc.latitude, lng=loc.longitude)
+            samples.append(time.perf_counter() - t)
+    report("legacy (stub geocoder)", samples)
+    print(f"  geocoder calls: {stub.calls}")
+
+
+def bench_legacy_timezone(rounds):
+    # the old command built a TimezoneFinder per call; this is that cost alone
+    from timezonefinder import TimezoneFinder
+    samples = []
+    for _ in range(rounds):
+        t = time.perf_counter()
+        TimezoneFinder().timezone_at(lat=35.6895, lng=139.6917)
+        samples.append(time.perf_counter() - t)
+    report("legacy TimezoneFinder()", samples)
+
+
+def bench_legacy_remote(rounds):
+    from geopy.geocoders import Nominatim
+    from timezonefinder import TimezoneFinder
+    queries = QUERIES + TYPOS + MISSES
+    samples = []
+    for i in range(rounds):
+        q = queries[i % len(queries)]
+        t = time.perf_counter()
+        loc = Nominatim(user_agent="time-bot-bench").geocode(q)
+        if loc:
+            TimezoneFinder().timezone_at(lat=loc.latitude, lng=loc.longitude)
+        samples.append(time.perf_counter() - t)
+        time.sleep(1)  # Nominatim usage policy: max 1 request/second
+    report("legacy remote path", samples)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=2000)
+    parser.add_argument("--stub-rounds", type=int, default=2)
+    parser.add_argument("--stub-latency-ms", type=float, default=150.0,
+                        help="simulated Nominatim round trip")
+    parser.add_argument("--remote", action="store_true")
+    parser.add_argument("--remote-rounds", type=int, default=15)
+    args = parser.parse_args()
+
+    asyncio.run(bench_gazetteer(args.rounds))
+    bench_fuzzy(args.rounds)
+    asyncio.run(bench_stubbed(args.stub_rounds, args.stub_latency_ms / 1000))
+    bench_legacy_timezone(max(5, args.rounds // 100))
+    if args.remote:
+        bench_legacy_remote(args.remote_rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+# benchmarks/bench_warnings.py
+# Fills a scratch warnings DB and measures per-member history query latency.
+#
+#   python benchmarks/bench_warnings.py --rows 1000000
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.warnstore import WarningStore
+
+
+async def run(rows, guilds, users, queries):
+    path = os.path.join(tempfile.mkdtemp(), "warnings.db")
+    store = WarningStore(path, batch_size=5000)
+    await store.start()
+
+    rng = random.Random(1)
+    start = time.perf_counter()
+    for _ in range(rows):
+        store.add(rng.randrange(guilds), rng.randrange(users), 1, "benchmark")
+    enqueue = time.perf_counter() - start
+    await store.flush()
+    total = time.perf_counter() - start
+    print(f"insert {rows} rows: enqueue {enqueue:.2f}s, committed {total:.2f}s ({rows / total:,.0f} rows/s)")
+
+    samples = []
+    for _ in range(queries):
+        g, u = rng.randrange(guilds), rng.randrange(users)
+        t = time.perf_counter()
+        store._read_sync(WarningStore._history_sync, (g, u, 10))
+        samples.append(time.perf_counter() - t)
+    samples.sort()
+    p50 = statistics.median(samples)
+    p99 = samples[int(len(samples) * 0.99)]
+    print(f"history query x{queries}: p50={p50 * 1e6:.0f}µs p99={p99 * 1e6:.0f}µs")
+
+    await store.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--guilds", type=int, default=50)
+    parser.add_argument("--users", type=int, default=200_000)
+    parser.add_argument("--queries", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.guilds, args.users, args.queries))
+
+
+if __name__ == "__main__":
+    main()
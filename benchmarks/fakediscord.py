@@ -0,0 +1,298 @@
+# benchmarks/fakediscord.py
+# Local stand-in for Discord used by loadtest.py: a fake aiohttp session
+# answering discord.py's REST calls (with latency, per-bucket rate limits and
+# injected 429s) and a fake gateway that feeds events straight into the
+# bot's ConnectionState. discord.py's own HTTP client, bucket handling and
+# 429 retry logic run unchanged on top of it.
+import asyncio
+import json
+import random
+import re
+import time
+from datetime import datetime, timedelta, timezone
+
+import discord
+
+_ID = re.compile(r"/\d+")
+# first path segment whose id is a rate-limit "major parameter"
+_MAJOR = re.compile(r"^/(channels|guilds|webhooks)/(\d+)")
+API_PREFIX = re.compile(r"^https?://[^/]+/api/v\d+")
+
+
+class _Snowflakes:
+    def __init__(self):
+        self._last = 0
+
+    def next(self, when=None):
+        value = discord.utils.time_snowflake(when or datetime.now(timezone.utc))
+        self._last = max(value, self._last + 1)
+        return self._last
+
+
+def user_payload(uid, *, bot=False):
+    return {"id": str(uid), "username": f"user{uid}", "discriminator": "0", "global_name": None,
+            "avatar": None, "bot": bot}
+
+
+def member_payload(uid, roles=()):
+    return {"user": user_payload(uid), "roles": [str(r) for r in roles],
+            "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False, "mute": False, "flags": 0}
+
+
+class FakeResponse:
+    def __init__(self, status, data=None, headers=None):
+        self.status = status
+        self.reason = {200: "OK", 204: "No Content", 403: "Forbidden", 404: "Not Found",
+                       429: "Too Many Requests"}.get(status, "")
+        self.headers = dict(headers or {})
+        self._body = ""
+        if data is not None:
+            self.headers["content-type"] = "application/json"
+            self._body = json.dumps(data)
+
+    async def text(self, encoding="utf-8"):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class _Request:
+    def __init__(self, coro):
+        self._coro = coro
+
+    async def __aenter__(self):
+        return await self._coro
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Drop-in for the aiohttp session inside discord.HTTPClient."""
+
+    def __init__(self, server):
+        self.server = server
+        self.closed = False
+
+    def request(self, method, url, **kwargs):
+        return _Request(self.server.handle(method, url, kwargs))
+
+    async def close(self):
+        self.closed = True
+
+
+class Bucket:
+    __slots__ = ("limit", "window", "remaining", "reset_at")
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.remaining = limit
+        self.reset_at = 0.0
+
+
+class FakeDiscord:
+    """REST routes the cogs use, backed by a small in-memory world.
+
+    latency/jitter  seconds added to every response
+    bucket_limit    requests per `bucket_window` per route+major id; going
+                    over returns a real-looking 429 with retry_after
+    error_rate      share of requests answered with a spurious 429
+    members         (guild_id, user_id) -> set(role ids); GET member 404s
+                    unless `is_member(guild_id, user_id)` says otherwise
+    """
+
+    def __init__(self, *, latency=0.03, jitter=0.01, bucket_limit=50, bucket_window=1.0,
+                 error_rate=0.0, seed=1):
+        self.latency = latency
+        self.jitter = jitter
+        self.bucket_limit = bucket_limit
+        self.bucket_window = bucket_window
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.ids = _Snowflakes()
+        self.state = None
+        self.bot_id = None
+        self.buckets = {}
+        self.history = {}        # channel_id -> {message_id: payload}
+        self.member_roles = {}   # (guild_id, user_id) -> set(role ids)
+        self.is_member = lambda guild_id, user_id: (guild_id, user_id) in self.member_roles
+        self.requests = 0
+        self.ratelimited = 0
+        self.by_route = {}
+
+    # ---- world ----
+    def attach(self, bot):
+        # what HTTPClient.static_login would have set up
+        bot.http._HTTPClient__session = FakeSession(self)
+        bot.http._global_over = asyncio.Event()
+        bot.http._global_over.set()
+        self.state = bot._connection
+        return self
+
+    def login(self, bot, bot_id):
+        self.bot_id = bot_id
+        self.state.user = discord.ClientUser(state=self.state, data=user_payload(bot_id, bot=True))
+        bot._ready.set()
+
+    def add_guild(self, guild_id, *, owner_id, channels=(), member_ids=(), member_count=None, roles=()):
+        everyone = {"id": str(guild_id), "name": "@everyone", "permissions": "1071698660929",
+                    "position": 0, "color": 0, "hoist": False, "managed": False, "mentionable": False}
+        for uid in member_ids:
+            self.member_roles.setdefault((guild_id, uid), set())
+        data = {
+            "id": str(guild_id), "name": f"guild {guild_id}", "owner_id": str(owner_id),
+            "roles": [everyone, *roles], "emojis": [], "stickers": [], "features": [],
+            "member_count": member_count if member_count is not None else len(member_ids),
+            "channels": [{"id": str(cid), "type": 0, "name": f"channel-{cid}", "position": i,
+                          "permission_overwrites": []} for i, cid in enumerate(channels)],
+            "members": [member_payload(uid) for uid in member_ids],
+        }
+        return self.state._add_guild_from_data(data)
+
+    def fill_history(self, channel_id, count, *, authors, age=timedelta(hours=1)):
+        now = datetime.now(timezone.utc)
+        messages = self.history.setdefault(channel_id, {})
+        for i in range(count):
+            when = now - age + age * (i / max(1, count))
+            mid = self.ids.next(when)
+            messages[mid] = {"id": str(mid), "channel_id": str(channel_id), "content": f"message {i}",
+                             "author": user_payload(self.rng.choice(authors)), "pinned": False,
+                             "timestamp": when.isoformat(), "type": 0, "attachments": [], "embeds": [],
+                             "mentions": [], "mention_roles": [], "mention_everyone": False, "tts": False,
+                             "edited_timestamp": None}
+
+    # ---- gateway ----
+    def message(self, guild_id, channel_id, author_id, content):
+        """Feed a MESSAGE_CREATE into the bot; returns the message id."""
+        mid = self.ids.next()
+        self.state.parse_message_create({
+            "id": str(mid), "channel_id": str(channel_id), "guild_id": str(guild_id),
+            "author": user_payload(author_id),
+            "member": {k: v for k, v in member_payload(author_id).items() if k != "user"},
+            "content": content, "timestamp": datetime.now(timezone.utc).isoformat(), "edited_timestamp": None,
+            "tts": False, "mention_everyone": False, "mentions": [], "mention_roles": [],
+            "attachments": [], "embeds": [], "pinned": False, "type": 0,
+        })
+        return mid
+
+    def _emit(self, event, data):
+        # gateway events for REST side effects arrive a moment after the response
+        asyncio.get_running_loop().call_soon(getattr(self.state, f"parse_{event}"), data)
+
+    # ---- REST ----
+    def _bucket(self, method, path):
+        template = _ID.sub("/{id}", path)
+        major = _MAJOR.match(path)
+        key = f"{method} {template}:{major.group(2) if major else ''}"
+        bucket = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = Bucket(self.bucket_limit, self.bucket_window)
+        return key, f"{method} {template}", bucket
+
+    async def handle(self, method, url, kwargs):
+        path = API_PREFIX.sub("", url.split("?", 1)[0])
+        key, route, bucket = self._bucket(method, path)
+        self.requests += 1
+        self.by_route[route] = self.by_route.get(route, 0) + 1
+        await asyncio.sleep(max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter)))
+
+        now = time.monotonic()
+        if now >= bucket.reset_at:
+            bucket.remaining = bucket.limit
+            bucket.reset_at = now + bucket.window
+        reset_after = max(0.0, bucket.reset_at - now)
+        if bucket.remaining <= 0 or self.rng.random() < self.error_rate:
+            self.ratelimited += 1
+            retry = reset_after if bucket.remaining <= 0 else 0.05
+            return FakeResponse(429, {"message": "You are being rate limited.", "retry_after": retry, "global": False},
+                                {"Via": "1.1 google", "X-Ratelimit-Bucket": key, "X-Ratelimit-Limit": str(bucket.limit),
+                                 "X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset-After": f"{retry:.3f}"})
+        bucket.remaining -= 1
+        headers = {"X-Ratelimit-Bucket": key, "X-Ratelimit-Limit": str(bucket.limit),
+                   "X-Ratelimit-Remaining": str(bucket.remaining), "X-Ratelimit-Reset-After": f"{reset_after:.3f}"}
+
+        body = kwargs.get("data")
+        payload = json.loads(body) if isinstance(body, (str, bytes)) and body else {}
+        status, data = self.route(method, path, payload, kwargs.get("params") or {})
+        return FakeResponse(status, data, headers)
+
+    def route(self, method, path, body, params):
+        parts = path.strip("/").split("/")
+        # /channels/{id}/messages...
+        if parts[0] == "channels":
+            channel_id = int(parts[1])
+            if parts[2:] == ["messages"] and method == "POST":
+                return 200, self._sent_message(channel_id, body)
+            if parts[2:] == ["messages"] and method == "GET":
+                return 200, self._history(channel_id, params)
+            if parts[2:] == ["messages", "bulk-delete"]:
+                for mid in body.get("messages", ()):
+                    self.history.get(channel_id, {}).pop(int(mid), None)
+                return 204, None
+            if len(parts) == 4 and parts[2] == "messages":
+                mid = int(parts[3])
+                if method == "DELETE":
+                    self.history.get(channel_id, {}).pop(mid, None)
+                    return 204, None
+                if method == "PATCH":
+                    return 200, self._sent_message(channel_id, body, mid=mid)
+            if parts[2] == "permissions":
+                return 204, None
+        # /users/@me/channels (open a DM)
+        if parts == ["users", "@me", "channels"]:
+            uid = int(body["recipient_id"])
+            return 200, {"id": str(uid + 1), "type": 1, "recipients": [user_payload(uid)], "last_message_id": None}
+        if parts[0] == "guilds":
+            guild_id = int(parts[1])
+            if parts[2:] == ["roles"] and method == "POST":
+                role = {"id": str(self.ids.next()), "name": body.get("name", "new role"), "permissions": "0",
+                        "position": 1, "color": 0, "hoist": False, "managed": False, "mentionable": False}
+                self._emit("guild_role_create", {"guild_id": str(guild_id), "role": role})
+                return 200, role
+            if len(parts) >= 4 and parts[2] == "members":
+                uid = int(parts[3])
+                if len(parts) == 6 and parts[4] == "roles":
+                    roles = self.member_roles.setdefault((guild_id, uid), set())
+                    (roles.add if method == "PUT" else roles.discard)(int(parts[5]))
+                    self._emit("guild_member_update", {"guild_id": str(guild_id), **member_payload(uid, roles)})
+                    return 204, None
+                if method == "GET":
+                    if not self.is_member(guild_id, uid):
+                        return 404, {"message": "Unknown Member", "code": 10007}
+                    return 200, member_payload(uid, self.member_roles.get((guild_id, uid), ()))
+                if method == "PATCH":
+                    return 200, member_payload(uid, self.member_roles.get((guild_id, uid), ()))
+                if method == "DELETE":
+                    self.member_roles.pop((guild_id, uid), None)
+                    return 204, None
+            if len(parts) == 4 and parts[2] == "bans":
+                return 204, None
+        return 404, {"message": "Unknown route", "code": 0}
+
+    def _sent_message(self, channel_id, body, *, mid=None):
+        mid = mid or self.ids.next()
+        return {"id": str(mid), "channel_id": str(channel_id), "content": body.get("content") or "",
+                "author": user_payload(self.bot_id, bot=True), "timestamp": datetime.now(timezone.utc).isoformat(),
+                "edited_timestamp": None, "tts": False, "mention_everyone": False, "mentions": [],
+                "mention_roles": [], "attachments": [], "embeds": body.get("embeds") or [], "pinned": False, "type": 0}
+
+    def _history(self, channel_id, params):
+        limit = int(params.get("limit", 50))
+        ids = sorted(self.history.get(channel_id, {}), reverse=True)
+        if "before" in params:
+            ids = [i for i in ids if i < int(params["before"])][:limit]
+        elif "after" in params:
+            ids = [i for i in ids if i > int(params["after"])][-limit:]
+        else:
+            ids = ids[:limit]
+        messages = self.history[channel_id] if ids else {}
+        return [messages[i] for i in ids]
+
+    def stats(self):
+        return {"requests": self.requests, "ratelimited": self.ratelimited,
+                "routes": dict(sorted(self.by_route.items(), key=lambda kv: -kv[1]))}
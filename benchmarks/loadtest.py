@@ -0,0 +1,245 @@
+# benchmarks/loadtest.py
+# Offline load test: runs the real Moderation, Misc and Debug cogs against
+# benchmarks/fakediscord.py (fake gateway + REST with latency and 429s) and
+# reports throughput, p50/p99 command latency and peak memory per workload.
+# Each workload runs in its own subprocess so peak RSS is per workload.
+#
+#   python benchmarks/loadtest.py                       # all workloads
+#   python benchmarks/loadtest.py ping mute --scale 0.1 # quick CI run
+#   python benchmarks/loadtest.py --latency 0.05 --error-rate 0.02 --json out.json
+#
+# "err" counts commands that raised; with --error-rate that includes REST
+# calls that got a 429 on all five of discord.py's attempts.
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+# snowflake-sized ids, so mention/ID converters treat them like real ones
+BASE = 10**17
+BOT_ID = BASE + 1
+MOD_ID = BASE + 2
+GUILD_ID = BASE + 1_000_000
+FIRST_CHANNEL = BASE + 2_000_000
+FIRST_MEMBER = BASE + 3_000_000
+WORKLOADS = ("ping", "mute", "mutual", "purge", "stats")
+
+
+def percentile(values, q):
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class Harness:
+    def __init__(self, args):
+        self.args = args
+        self.started = {}    # trigger message id -> perf_counter at dispatch
+        self.latencies = []
+        self.errors = 0
+        self.done = asyncio.Event()
+        self.expected = 0
+
+    async def setup(self):
+        # imported here so DATA_DIR is set before utils.config reads it
+        import discord
+        from discord.ext import commands
+        from fakediscord import FakeDiscord
+        from utils.metrics import install_command_metrics
+
+        intents = discord.Intents.default()
+        intents.message_content = True
+        intents.members = True
+        self.bot = commands.Bot(command_prefix="-", intents=intents, help_command=None)
+        await self.bot.__aenter__()
+        self.fake = FakeDiscord(latency=self.args.latency, jitter=self.args.jitter,
+                                bucket_limit=self.args.bucket_limit, bucket_window=self.args.bucket_window,
+                                error_rate=self.args.error_rate).attach(self.bot)
+        self.fake.login(self.bot, BOT_ID)
+        install_command_metrics(self.bot)
+        self.bot.add_listener(self._completed, "on_command_completion")
+        self.bot.add_listener(self._failed, "on_command_error")
+
+    async def load_cogs(self):
+        for name in ("cogs.moderation", "cogs.misc", "cogs.debug"):
+            await self.bot.load_extension(name)
+        self.bot.dispatch("ready")
+        await asyncio.sleep(0)
+
+    async def close(self):
+        for name in list(self.bot.extensions):
+            await self.bot.unload_extension(name)
+        await self.bot.__aexit__(None, None, None)
+
+    def _finish(self, ctx, ok):
+        started = self.started.pop(ctx.message.id, None)
+        if started is None:
+            return
+        self.latencies.append(time.perf_counter() - started)
+        if not ok:
+            self.errors += 1
+        if not self.started and len(self.latencies) >= self.expected:
+            self.done.set()
+
+    async def _completed(self, ctx):
+        self._finish(ctx, True)
+
+    async def _failed(self, ctx, error):
+        self._finish(ctx, False)
+
+    async def run(self, commands_):
+        """Dispatch (channel_id, content) messages from the moderator at
+        --rate per second (0 = all at once) and wait for every command."""
+        self.expected = len(commands_)
+        interval = 1.0 / self.args.rate if self.args.rate else 0
+        started = time.perf_counter()
+        for i, (channel_id, content) in enumerate(commands_):
+            if interval:
+                delay = started + i * interval - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            # dispatch only schedules the command, so it can't finish before this is recorded
+            self.started[self.fake.message(GUILD_ID, channel_id, MOD_ID, content)] = time.perf_counter()
+        await asyncio.wait_for(self.done.wait(), timeout=self.args.timeout)
+        return time.perf_counter() - started
+
+
+def ops_guild(fake, channels, members):
+    channel_ids = [FIRST_CHANNEL + i for i in range(channels)]
+    member_ids = [FIRST_MEMBER + i for i in range(members)]
+    fake.add_guild(GUILD_ID, owner_id=MOD_ID, channels=channel_ids,
+                   member_ids=[BOT_ID, MOD_ID, *member_ids])
+    return channel_ids, member_ids
+
+
+async def workload(name, args):
+    h = Harness(args)
+    await h.setup()
+    fake = h.fake
+    n = lambda base: max(1, int(base * args.scale))
+    extra = {}
+
+    if name == "ping":
+        channels, _ = ops_guild(fake, 50, 10)
+        await h.load_cogs()
+        cmds = [(channels[i % len(channels)], "-ping") for i in range(n(10_000))]
+    elif name == "mute":
+        channels, members = ops_guild(fake, 20, n(1_000))
+        await h.load_cogs()
+        cmds = [(channels[i % len(channels)], f"-mute <@{uid}> 600 load test") for i, uid in enumerate(members)]
+    elif name == "mutual":
+        channels, _ = ops_guild(fake, 1, 10)
+        guilds = n(5_000)
+        for i in range(guilds):
+            # unchunked guilds: the cog has to ask REST about each one
+            fake.add_guild(GUILD_ID + 1 + i, owner_id=1, member_ids=[BOT_ID], member_count=1_000)
+        target = BASE + 9_999_999
+        fake.is_member = lambda guild_id, user_id: user_id == target and guild_id % 10 == 0
+        await h.load_cogs()
+        cmds = [(channels[0], f"-mutual {target}")]
+        extra["guilds"] = guilds + 1
+    elif name == "purge":
+        storms = n(20)
+        channels, members = ops_guild(fake, storms, 50)
+        for cid in channels:
+            fake.fill_history(cid, 1_000, authors=members)
+        await h.load_cogs()
+        cmds = [(cid, "-purge 500") for cid in channels]
+    elif name == "stats":
+        channels, _ = ops_guild(fake, 20, 10)
+        await h.load_cogs()
+        cmds = [(channels[i % len(channels)], "-stats") for i in range(n(1_000))]
+    else:
+        raise SystemExit(f"unknown workload {name!r}")
+
+    from utils.loader import rss_bytes
+    rss_before = rss_bytes()
+    elapsed = await h.run(cmds)
+    if name == "mute":
+        mod = h.bot.get_cog("Moderation")
+        extra["scheduled_unmutes"] = sum(1 for _, content in cmds
+                                         if mod.scheduler.pending("unmute", GUILD_ID, int(content.split("<@")[1].split(">")[0])))
+    if name == "purge":
+        extra["messages_deleted"] = sum(1000 - len(fake.history[cid]) for cid in fake.history)
+    await h.close()
+
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return {
+        "workload": name,
+        "commands": len(cmds),
+        "errors": h.errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_per_s": round(len(cmds) / elapsed, 1) if elapsed else None,
+        "p50_ms": round(percentile(h.latencies, 0.50) * 1000, 1),
+        "p99_ms": round(percentile(h.latencies, 0.99) * 1000, 1),
+        "mean_ms": round(statistics.fmean(h.latencies) * 1000, 1),
+        "rest_requests": fake.requests,
+        "rest_429s": fake.ratelimited,
+        "rss_before_mb": round(rss_before / 2**20, 1) if rss_before else None,
+        "peak_rss_mb": round(peak / 2**20, 1),
+        **extra,
+    }
+
+
+def child(name, argv):
+    args = parse_args(argv)
+    os.environ["DATA_DIR"] = tempfile.mkdtemp(prefix="loadtest-")
+    os.environ["SYNC_COMMANDS"] = "0"
+    os.chdir(ROOT)
+    result = asyncio.run(workload(name, args))
+    print("RESULT " + json.dumps(result))
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test against a fake Discord.")
+    parser.add_argument("workloads", nargs="*", default=list(WORKLOADS), help=f"any of {', '.join(WORKLOADS)}")
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply workload sizes (0.1 for a quick run)")
+    parser.add_argument("--latency", type=float, default=0.03, help="fake REST latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--bucket-limit", type=int, default=50, help="requests per bucket window before a 429")
+    parser.add_argument("--bucket-window", type=float, default=1.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with a spurious 429")
+    parser.add_argument("--rate", type=float, default=0.0, help="commands dispatched per second (0 = all at once)")
+    parser.add_argument("--timeout", type=float, default=600.0)
+    parser.add_argument("--json", help="also write the results to this file")
+    return parser.parse_args(argv)
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == "--child":
+        child(sys.argv[2], sys.argv[3:])
+        return
+    args = parse_args()
+    passthrough = [a for a in sys.argv[1:] if a not in args.workloads]
+    results = []
+    print(f"{'workload':<9}{'cmds':>7}{'err':>5}{'time':>8}{'cmd/s':>9}{'p50':>9}{'p99':>9}{'REST':>8}{'429':>6}{'peak MB':>9}")
+    for name in args.workloads:
+        out = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", name, *passthrough],
+                             cwd=ROOT, capture_output=True, text=True)
+        line = next((l for l in out.stdout.splitlines() if l.startswith("RESULT ")), None)
+        if out.returncode != 0 or line is None:
+            print(f"{name:<9} failed:\n{out.stderr[-2000:]}")
+            continue
+        r = json.loads(line[len("RESULT "):])
+        results.append(r)
+        print(f"{name:<9}{r['commands']:>7}{r['errors']:>5}{r['elapsed_s']:>7.1f}s{r['throughput_per_s']:>9.1f}"
+              f"{r['p50_ms']:>7.0f}ms{r['p99_ms']:>7.0f}ms{r['rest_requests']:>8}{r['rest_429s']:>6}{r['peak_rss_mb']:>9.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    if len(results) < len(args.workloads):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,17 +1,44 @@
 # bot.py (entrypoint - loads cogs, syncs commands, keepalive)
 import os
+import time
 import asyncio
 import discord
 from discord.ext import commands
 from dotenv import load_dotenv
 
+from utils.cluster import Cluster, parse_shard_ids
+from utils.health import HealthServer
+from utils.hotreload import ExtensionWatcher
+from utils.loader import format_report, load_cogs
+from utils.members import install_member_cache, member_cache_options
+from utils.metrics import install_command_metrics, install_ratelimit_metrics
+from utils.sync import sync_if_changed
+
 load_dotenv()
 
 intents = discord.Intents.default()
 intents.message_content = True
 intents.members = True
 
-bot = commands.Bot(command_prefix="-", intents=intents, help_command=None)
+# MEMBER_CACHE=full|lazy|lru trades member-cache memory for REST lookups
+# (see utils/members.py); MEMBER_LRU_SIZE bounds the lru profile
+MEMBER_CACHE = os.getenv("MEMBER_CACHE", "full").lower()
+cache_options = member_cache_options(MEMBER_CACHE)
+
+# SHARD_COUNT/SHARD_IDS (set by launcher.py, or by hand) switch to an
+# AutoShardedBot that only runs the given shards in this process
+SHARD_COUNT = int(os.getenv("SHARD_COUNT", "0")) or None
+SHARD_IDS = parse_shard_ids(os.getenv("SHARD_IDS"))
+if SHARD_COUNT or os.getenv("SHARDED") == "1":
+    bot = commands.AutoShardedBot(command_prefix="-", intents=intents, help_command=None,
+                                  shard_count=SHARD_COUNT, shard_ids=SHARD_IDS, **cache_options)
+else:
+    bot = commands.Bot(command_prefix="-", intents=intents, help_command=None, **cache_options)
+
+install_member_cache(bot, MEMBER_CACHE, maxsize=int(os.getenv("MEMBER_LRU_SIZE", "5000")))
+
+# lets cogs query the other worker processes (see launcher.py / utils/cluster.py)
+bot.cluster = Cluster.from_env()
 
 # --- safe GUILD_ID parsing + diagnostics ---
 guild_id_raw = os.getenv("GUILD_ID")
@@ -25,6 +52,12 @@ else:
     print("⚠️ GUILD_ID not set. Guild-specific sync will be skipped.")
     GUILD_ID = None
 
+# scope used for syncs after a hot reload (utils/hotreload.py)
+bot.sync_guild = discord.Object(id=GUILD_ID) if GUILD_ID else None
+
+# on_ready fires again after every reconnect; the tree only needs syncing once
+commands_synced = False
+
 @bot.event
 async def on_ready():
     print(f"✅ Logged in as {bot.user} (id={getattr(bot.user,'id',None)})")
@@ -49,16 +82,28 @@ async def on_ready():
     except Exception as e:
         print("Error enumerating guilds:", e)
 
-    # sync commands (guild-fast if GUILD_ID provided, else global)
+    # sync commands (guild-fast if GUILD_ID provided, else global), at most
+    # once per process and only when the tree's hash changed since last sync
+    global commands_synced
+    if commands_synced:
+        return
+    # under launcher.py only one worker pushes the tree
+    if os.getenv("SYNC_COMMANDS", "1") == "0":
+        return
+    commands_synced = True
     try:
+        force = os.getenv("FORCE_SYNC") == "1"
         if GUILD_ID:
             guild_obj = discord.Object(id=GUILD_ID)
-            synced = await bot.tree.sync(guild=guild_obj)
-            print(f"✅ Synced {len(synced)} slash command(s) to guild {GUILD_ID}.")
+            synced = await sync_if_changed(bot, guild_obj, force=force)
+            if synced is not None:
+                print(f"✅ Synced {len(synced)} slash command(s) to guild {GUILD_ID}.")
         else:
-            synced = await bot.tree.sync()
-            print(f"✅ Synced {len(synced)} slash command(s) globally.")
+            synced = await sync_if_changed(bot, force=force)
+            if synced is not None:
+                print(f"✅ Synced {len(synced)} slash command(s) globally.")
     except Exception as e:
+        commands_synced = False
         print("❌ Sync error:", repr(e))
 
 
@@ -86,28 +131,21 @@ async def on_app_command_error(interaction, error):
 
 
 # -------------------- KEEP RENDER ALIVE --------------------
-from threading import Thread
-from flask import Flask
-
-app = Flask('')
-
-@app.route('/')
-def home():
-    return "Bot is alive!"
-
-def run_flask():
-    app.run(host='0.0.0.0', port=8080)
-
-Thread(target=run_flask).start()
+# health/metrics endpoint served from the bot's own event loop (see utils/health.py)
+install_command_metrics(bot)
+install_ratelimit_metrics()
+health = HealthServer(
+    bot, host="0.0.0.0", port=int(os.getenv("PORT", "8080")),
+    stall_threshold=float(os.getenv("LOOP_STALL_THRESHOLD", "0.25")),
+)
+bot.loop_watchdog = health.lag_monitor
+bot.cluster.attach(health.app)
 
 
 # -------------------- LOAD COGS & RUN --------------------
 async def main():
     print(">> Starting cog loader (root files):", os.listdir("."), flush=True)
 
-    import traceback
-    import asyncio
-
     print(">> debug: server-side cogs path exists?", os.path.exists("cogs"), flush=True)
     try:
         cogs_listing = os.listdir("cogs")
@@ -115,37 +153,41 @@ async def main():
         cogs_listing = f"ERROR listing cogs: {e!r}"
     print(">> debug: cogs folder listing (server):", cogs_listing, flush=True)
 
-    cogs_path = "cogs"
-    if os.path.exists(cogs_path):
-        for filename in sorted(os.listdir(cogs_path)):
-            print(f">> debug: found in cogs/: {filename}", flush=True)
-            if filename.endswith(".py") and filename != "__init__.py":
-                module_name = f"cogs.{filename[:-3]}"
-                print(f">> attempting to load {module_name}", flush=True)
-                try:
-                    # use a timeout so a blocking import/setup can't hang the loader forever
-                    await asyncio.wait_for(bot.load_extension(module_name), timeout=12.0)
-                    print(f"✅ Loaded cog: {module_name}", flush=True)
-                except asyncio.TimeoutError:
-                    print(f"⏱️ Timeout while loading {module_name} (took >12s).", flush=True)
-                    print("---- FULL TRACEBACK ----", flush=True)
-                    print(traceback.format_exc(), flush=True)
-                    print("---- end traceback ----", flush=True)
-                except Exception as e:
-                    print(f"❌ Failed to load {module_name}: {repr(e)}", flush=True)
-                    print("---- FULL TRACEBACK ----", flush=True)
-                    print(traceback.format_exc(), flush=True)
-                    print("---- end traceback ----", flush=True)
-    else:
-        print("❌ cogs folder not found!", flush=True)
-
     DISCORD_TOKEN = os.getenv("DISCORD_TOKEN")
     if not DISCORD_TOKEN:
         print("❌ DISCORD_TOKEN not found", flush=True)
         raise SystemExit(1)
 
+    # cogs are loaded inside `async with bot` so background tasks they start
+    # in cog_load (e.g. the punishment scheduler) can use wait_until_ready()
     async with bot:
-        await bot.start(DISCORD_TOKEN)
+        cogs_path = "cogs"
+        if os.path.exists(cogs_path):
+            started = time.perf_counter()
+            bot.cog_timings = await load_cogs(bot, cogs_path, timeout=12.0)
+            print(">> Cog startup report:\n" + format_report(bot.cog_timings, time.perf_counter() - started), flush=True)
+        else:
+            print("❌ cogs folder not found!", flush=True)
+
+        # HOT_RELOAD=1: reload cogs in place when their files change
+        watcher = None
+        if os.getenv("HOT_RELOAD") == "1":
+            watcher = ExtensionWatcher(bot, "cogs")
+            watcher.start()
+            print(">> Hot reload enabled (watching cogs/)", flush=True)
+
+        try:
+            await health.start()
+        except OSError as e:
+            # e.g. the port is taken: run without /health and /metrics rather than not at all
+            print(f"⚠️ Health server not started on port {health.port}: {e}", flush=True)
+        try:
+            await bot.start(DISCORD_TOKEN)
+        finally:
+            if watcher is not None:
+                await watcher.close()
+            await bot.cluster.close()
+            await health.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -0,0 +1,119 @@
+# cogs/automod.py (automatic spam / raid filter; acts through the Moderation cog)
+import time
+
+import discord
+from discord import app_commands
+from discord.ext import commands
+
+from utils.antispam import JoinRaidDetector, SpamFilter
+from utils.handoff import HANDOFF
+
+AUTOMOD_MUTE_SECONDS = 600
+RAID_ACTIONS = ("off", "mute", "kick", "ban")
+
+
+class AutoMod(commands.Cog):
+    def __init__(self, bot):
+        self.bot = bot
+        # sliding windows survive a hot reload, so a reload mid-raid doesn't reset detection
+        self.filter, self.raids = HANDOFF.claim("automod", owner=self) or (SpamFilter(), JoinRaidDetector())
+
+    def cog_unload(self):
+        if HANDOFF.active:
+            HANDOFF.stash("automod", (self.filter, self.raids))
+
+    @property
+    def moderation(self):
+        return self.bot.get_cog("Moderation")
+
+    @staticmethod
+    def _exempt(member):
+        perms = getattr(member, "guild_permissions", None)
+        return perms is None or perms.manage_messages
+
+    @commands.Cog.listener()
+    async def on_message(self, message):
+        if message.guild is None or message.author.bot:
+            return
+        mod = self.moderation
+        if mod is None or not mod.config.get(message.guild.id, "automod"):
+            return
+        if self._exempt(message.author):
+            return
+
+        mentions = len(message.raw_mentions) + len(message.raw_role_mentions) + (20 if message.mention_everyone else 0)
+        reason = self.filter.check(message.guild.id, message.author.id, message.content, mentions, time.monotonic())
+        if reason is None:
+            return
+
+        try:
+            await message.delete()
+        except (discord.Forbidden, discord.NotFound, discord.HTTPException):
+            pass
+        try:
+            await mod.mute_member(
+                message.guild, message.author, duration=AUTOMOD_MUTE_SECONDS,
+                reason=f"AutoMod: {reason}", channel_id=message.channel.id,
+            )
+        except (discord.Forbidden, discord.HTTPException) as e:
+            print(f"❌ AutoMod couldn't mute {message.author} in {message.guild}: {e!r}")
+            return
+        mod.audit.emit(message.guild.id, "automod", self.bot.user.id, message.author.id, reason,
+                       punishment="mute", duration=f"{AUTOMOD_MUTE_SECONDS}s")
+        try:
+            await message.channel.send(
+                f"🤖 Muted {message.author.mention} for `{AUTOMOD_MUTE_SECONDS}` seconds | Reason: `{reason}`"
+            )
+        except (discord.Forbidden, discord.HTTPException):
+            pass
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        mod = self.moderation
+        if mod is None:
+            return
+        action = mod.config.get(member.guild.id, "raid_action")
+        if action == "off" or not self.raids.record_join(member.guild.id, time.monotonic()):
+            return
+        reason = "AutoMod: join raid"
+        try:
+            if action == "ban":
+                await member.ban(reason=reason, delete_message_seconds=0)
+            elif action == "kick":
+                await member.kick(reason=reason)
+            else:
+                await mod.mute_member(member.guild, member, duration=AUTOMOD_MUTE_SECONDS, reason=reason)
+        except (discord.Forbidden, discord.HTTPException) as e:
+            print(f"❌ AutoMod raid {action} failed for {member} in {member.guild}: {e!r}")
+            return
+        mod.audit.emit(member.guild.id, "automod", self.bot.user.id, member.id, reason, punishment=action)
+
+    @commands.hybrid_command(name="automod", description="Configure the automatic spam and raid filter.")
+    @commands.has_permissions(manage_guild=True)
+    @app_commands.describe(setting="on, off, or raid", value="For raid: off, mute, kick or ban")
+    async def automod(self, ctx: commands.Context, setting: str = None, value: str = None):
+        mod = self.moderation
+        if mod is None:
+            await ctx.send("❌ Moderation cog is not loaded.")
+            return
+        setting = (setting or "").lower()
+        if setting in ("on", "off"):
+            await mod.config.set(ctx.guild.id, automod=setting == "on")
+        elif setting == "raid" and value and value.lower() in RAID_ACTIONS:
+            await mod.config.set(ctx.guild.id, raid_action=value.lower())
+        elif setting:
+            await ctx.send("❌ Usage: `-automod on|off` or `-automod raid off|mute|kick|ban`")
+            return
+        enabled = "on" if mod.config.get(ctx.guild.id, "automod") else "off"
+        await ctx.send(f"🤖 AutoMod spam filter: `{enabled}` | join-raid action: `{mod.config.get(ctx.guild.id, 'raid_action')}`")
+
+    @automod.error
+    async def automod_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await ctx.send("❌ You don't have permission.")
+        else:
+            await ctx.send(f"❌ An error occurred: {error}")
+
+
+async def setup(bot):
+    await bot.add_cog(AutoMod(bot))
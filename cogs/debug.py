@@ -1,9 +1,47 @@
 # cogs/debug.py
+import io
+import json
+import time
+
+import discord
 from discord.ext import commands
 
+from utils import hotreload
+from utils.metrics import stats_snapshot
+
+def _latency_ms(latency):
+    # latency is nan/inf until the first heartbeat ack
+    if latency != latency or latency == float("inf"):
+        return None
+    return round(latency * 1000, 1)
+
 class Debug(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        self.cluster = getattr(bot, "cluster", None)
+        if self.cluster is not None:
+            self.cluster.register("shards", self._cluster_shards)
+
+    def cog_unload(self):
+        if self.cluster is not None:
+            self.cluster.unregister("shards")
+
+    def _local_shards(self):
+        guilds = {}
+        for g in self.bot.guilds:
+            guilds[g.shard_id] = guilds.get(g.shard_id, 0) + 1
+        shards = getattr(self.bot, "shards", None)
+        if not shards:
+            return [{"id": 0, "latency_ms": _latency_ms(self.bot.latency),
+                     "closed": self.bot.is_closed(), "guilds": guilds.get(0, 0)}]
+        rows = []
+        for shard_id, shard in sorted(shards.items()):
+            rows.append({"id": shard_id, "latency_ms": _latency_ms(shard.latency),
+                         "closed": shard.is_closed(), "guilds": guilds.get(shard_id, 0)})
+        return rows
+
+    async def _cluster_shards(self, params):
+        return self._local_shards()
 
     @commands.command(name="whoami")
     async def whoami(self, ctx):
@@ -21,5 +59,139 @@ class Debug(commands.Cog):
         names = [c.name for c in self.bot.tree.walk_commands()]
         await ctx.send("App/tree commands: " + (", ".join(names) or "NONE"))
 
+    @commands.command(name="stats")
+    async def stats(self, ctx, fmt: str = None):
+        # per-command latency split (own code vs Discord REST) and error rates
+        snapshot = stats_snapshot()
+        if fmt == "json":
+            data = io.BytesIO(json.dumps(snapshot, indent=2).encode())
+            await ctx.send(file=discord.File(data, filename="stats.json"))
+            return
+        if not snapshot:
+            await ctx.send("No commands recorded yet.")
+            return
+        lines = [f"{'command':<12}{'n':>6}{'err%':>6}{'avg':>9}{'own':>9}{'rest':>9}{'p99≤':>9}"]
+        for name, s in sorted(snapshot.items(), key=lambda kv: -kv[1]["count"]):
+            p99 = f"{s['p99_ms_le']:.0f}ms" if s["p99_ms_le"] is not None else ">30s"
+            lines.append(
+                f"{name:<12}{s['count']:>6}{s['error_rate'] * 100:>5.1f}%"
+                f"{s['avg_ms']:>7.1f}ms{s['avg_own_ms']:>7.1f}ms{s['avg_rest_ms']:>7.1f}ms{p99:>9}"
+            )
+        await ctx.send("```\n" + "\n".join(lines[:25]) + "\n```")
+
+    @commands.command(name="stalls")
+    @commands.is_owner()
+    async def stalls(self, ctx, index: int = None):
+        # recent event-loop stalls caught by the watchdog; -stalls <n> shows a stack
+        watchdog = getattr(self.bot, "loop_watchdog", None)
+        if watchdog is None:
+            await ctx.send("Loop watchdog is not running.")
+            return
+        reports = list(watchdog.reports)[::-1]
+        if not reports:
+            await ctx.send(f"✅ No loop stalls over {watchdog.threshold * 1000:.0f}ms recorded.")
+            return
+        if index is not None:
+            if not 1 <= index <= len(reports):
+                await ctx.send(f"Pick 1–{len(reports)}.")
+                return
+            r = reports[index - 1]
+            stack = "".join(r.stack)[-1800:]
+            await ctx.send(f"Stall #{index} in {r.cog or '?'} / {r.command or '?'} at {r.location}:\n```py\n{stack}\n```")
+            return
+        lines = []
+        for i, r in enumerate(reports[:15], 1):
+            took = f"{r.duration * 1000:.0f}ms" if r.duration is not None else f">{r.blocked_for * 1000:.0f}ms"
+            ago = int(time.time() - r.at)
+            lines.append(f"#{i:<3}{took:>9}  {r.cog or '?'}/{r.command or '?'}  {r.location}  ({ago}s ago)")
+        await ctx.send("```\n" + "\n".join(lines) + "\n```")
+
+    @commands.command(name="startup")
+    async def startup(self, ctx):
+        # per-cog import/setup timings recorded by bot.py at boot
+        timings = getattr(self.bot, "cog_timings", None)
+        if not timings:
+            await ctx.send("No startup report recorded.")
+            return
+        from utils.loader import format_report
+        await ctx.send("```\n" + format_report(timings) + "\n```")
+
+    @commands.command(name="shards")
+    async def shards(self, ctx):
+        # per-shard gateway status, including shards run by other launcher workers
+        rows = [(self.cluster.cluster_id if self.cluster else 0, r) for r in self._local_shards()]
+        missing = 0
+        if self.cluster is not None:
+            answers = await self.cluster.gather("shards")
+            for answer in answers:
+                rows.extend((answer["cluster_id"], r) for r in answer["result"])
+            missing = len(self.cluster.peers) - len(answers)
+        rows.sort(key=lambda cr: cr[1]["id"])
+        here = ctx.guild.shard_id if ctx.guild else None
+        lines = [f"{'shard':<7}{'worker':>7}{'latency':>10}{'guilds':>8}  status"]
+        for worker, r in rows:
+            latency = f"{r['latency_ms']:.0f}ms" if r["latency_ms"] is not None else "-"
+            status = "closed" if r["closed"] else "up"
+            mark = " ←" if r["id"] == here else ""
+            lines.append(f"{r['id']:<7}{worker:>7}{latency:>10}{r['guilds']:>8}  {status}{mark}")
+        lines = lines[:40]
+        if missing:
+            lines.append(f"⚠️ {missing} worker(s) didn't answer")
+        await ctx.send("```\n" + "\n".join(lines) + "\n```")
+
+    @commands.command(name="memcache")
+    async def memcache(self, ctx):
+        # member cache profile and how much of it is populated
+        cache = getattr(self.bot, "member_cache", None)
+        if cache is None:
+            await ctx.send("Member cache not installed.")
+            return
+        await ctx.send("```\n" + json.dumps(cache.stats(), indent=2) + "\n```")
+
+    # hot reload (owner only): -reload moderation, -reload all, -load x, -unload x
+    async def _extensions(self, ctx, op, names):
+        if not names:
+            await ctx.send(f"❌ Usage: `-{op} <cog> [cog...]`" + (" or `-reload all`" if op == "reload" else ""))
+            return
+        if op == "reload" and names == ("all",):
+            targets = [n for n in self.bot.extensions if n.startswith("cogs.")]
+        else:
+            targets = [hotreload.extension_name(n) for n in names]
+        results = await hotreload.apply(self.bot, op, targets)
+        lines = [f"{'✅' if error is None else '❌'} {op} `{name}`" + (f": {error}" if error else "")
+                 for name, error in results]
+        await ctx.send("\n".join(lines)[:1900])
+
+    @commands.command(name="reload")
+    @commands.is_owner()
+    async def reload(self, ctx, *names):
+        await self._extensions(ctx, "reload", names)
+
+    @commands.command(name="load")
+    @commands.is_owner()
+    async def load(self, ctx, *names):
+        await self._extensions(ctx, "load", names)
+
+    @commands.command(name="unload")
+    @commands.is_owner()
+    async def unload(self, ctx, *names):
+        await self._extensions(ctx, "unload", names)
+
+    @commands.command(name="geocache")
+    async def geocache(self, ctx):
+        # hit/miss counters for the -time resolver caches
+        misc = self.bot.get_cog("Misc")
+        resolver = getattr(misc, "resolver", None)
+        if resolver is None:
+            await ctx.send("Misc cog not loaded.")
+            return
+        lines = []
+        for name, s in resolver.stats().items():
+            if "maxsize" in s:
+                lines.append(f"{name}: size={s['size']}/{s['maxsize']} hits={s['hits']} misses={s['misses']} hit_rate={s['hit_rate']}")
+            else:
+                lines.append(f"{name}: size={s['size']} hits={s['hits']}")
+        await ctx.send("```\n" + "\n".join(lines) + "\n```")
+
 async def setup(bot):
     await bot.add_cog(Debug(bot))
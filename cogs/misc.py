@@ -1,14 +1,74 @@
+import asyncio
 from discord.ext import commands
 from discord import app_commands
 import discord
 import pytz
 from datetime import datetime
-from geopy.geocoders import Nominatim
-from timezonefinder import TimezoneFinder
+from utils.gazetteer import Gazetteer
+from utils.handoff import HANDOFF
+from utils.geo import LocationResolver
+from utils.mutual import MutualGuildIndex
 
 class Misc(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        state = HANDOFF.claim("misc", owner=self)
+        if state is not None:
+            # hot reload: keep the warm geocode caches and the mutual index
+            self.resolver, self.mutual_index = state
+        else:
+            # one geocoder/timezone finder shared by every -time call
+            self.resolver = LocationResolver(user_agent="time-bot", gazetteer=Gazetteer())
+            # user id -> guild ids, kept current from member events
+            self.mutual_index = MutualGuildIndex(concurrency=8)
+            if self.bot.is_ready():
+                self.mutual_index.rebuild(self.bot.guilds)
+        # other shard workers ask us for our part of a -mutual lookup
+        self.cluster = getattr(bot, "cluster", None)
+        if self.cluster is not None:
+            self.cluster.register("mutual", self._cluster_mutual)
+
+    def cog_unload(self):
+        if self.cluster is not None:
+            self.cluster.unregister("mutual")
+        if HANDOFF.active:
+            HANDOFF.stash("misc", (self.resolver, self.mutual_index))
+
+    async def _cluster_mutual(self, params):
+        names = []
+        async for found, checked, total, done in self.mutual_index.scan(self.bot.guilds, int(params["user_id"])):
+            names = [g.name for g in found]
+        return names
+
+    # ---- mutual index upkeep ----
+    @commands.Cog.listener()
+    async def on_ready(self):
+        self.mutual_index.rebuild(self.bot.guilds)
+
+    @commands.Cog.listener()
+    async def on_guild_join(self, guild):
+        self.mutual_index.index_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_available(self, guild):
+        self.mutual_index.index_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_chunked(self, guild):
+        # MEMBER_CACHE=lazy chunks guilds on first use (utils/members.py)
+        self.mutual_index.index_guild(guild)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.mutual_index.drop_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_member_join(self, member):
+        self.mutual_index.add(member.guild.id, member.id)
+
+    @commands.Cog.listener()
+    async def on_raw_member_remove(self, payload):
+        self.mutual_index.remove(payload.guild_id, payload.user.id)
 
     # hybrid ping (works as -ping and /ping)
     @commands.hybrid_command(name="ping", description="Check if the bot is online (hybrid)")
@@ -27,11 +87,19 @@ class Misc(commands.Cog):
         embed.add_field(name=f"{prefix}ping", value="Check if the bot is online", inline=False)
         embed.add_field(name=f"{prefix}kick @user [reason]", value="Kick a user from the server", inline=False)
         embed.add_field(name=f"{prefix}ban @user [reason]", value="Ban a user from the server", inline=False)
+        embed.add_field(name=f"{prefix}tempban @user <seconds> [reason]", value="Ban a user for a limited time", inline=False)
         embed.add_field(name=f"{prefix}unban [name#1234 or ID]", value="Unban a user by tag or ID", inline=False)
         embed.add_field(name=f"{prefix}mute @user [seconds] [reason]", value="Mute a user", inline=False)
         embed.add_field(name=f"{prefix}unmute @user", value="Unmute a muted user", inline=False)
+        embed.add_field(name=f"{prefix}mutemode role|timeout", value="Mute with the Muted role or Discord's timeout", inline=False)
+        embed.add_field(name=f"{prefix}muterole [@role]", value="Set or show the Muted role", inline=False)
+        embed.add_field(name=f"{prefix}massban / masskick / massmute users: <ids> [reason: ...] [dm: yes]", value="Act on many users at once (IDs, mentions or an attached ID list)", inline=False)
         embed.add_field(name=f"{prefix}warn @user [reason]", value="Warn a user", inline=False)
-        embed.add_field(name=f"{prefix}purge [1–100]", value="Delete messages in bulk", inline=False)
+        embed.add_field(name=f"{prefix}warnings @user", value="Show a user's warning history", inline=False)
+        embed.add_field(name=f"{prefix}clearwarns @user", value="Clear a user's warnings", inline=False)
+        embed.add_field(name=f"{prefix}setmodlog [#channel]", value="Log moderation actions to a channel", inline=False)
+        embed.add_field(name=f"{prefix}modlog [moderator: @user] [target: @user] [action: ban] [hours: 24]", value="Search recorded moderation actions", inline=False)
+        embed.add_field(name=f"{prefix}purge [1–5000] [user: @user] [contains: regex] [bots: yes] [attachments: yes] [minutes: N] [pinned: no]", value="Delete messages in bulk, optionally filtered (pinned ones too, unless pinned: no)", inline=False)
         embed.set_footer(text="Bot developed by cubicc__ • Use commands responsibly.")
         await ctx.send(embed=embed)
 
@@ -44,32 +112,48 @@ class Misc(commands.Cog):
             return
 
         uid = int(user_id)
+        status = None
         mutual_guilds = []
+        # guilds on shards run by other processes are scanned there, in parallel
+        peers = None
+        if self.cluster is not None and self.cluster.peers:
+            peers = asyncio.create_task(self.cluster.gather("mutual", {"user_id": uid}, timeout=30.0))
 
-        for guild in self.bot.guilds:
-            member = guild.get_member(uid)
-            if member:
-                mutual_guilds.append(guild.name)
-                continue
-            try:
-                await guild.fetch_member(uid)
-                mutual_guilds.append(guild.name)
-            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-                pass
+        async for found, checked, total, done in self.mutual_index.scan(self.bot.guilds, uid):
+            mutual_guilds = [g.name for g in found]
+            if done:
+                break
+            # a full scan is still running: show what we have so far
+            text = f"🔎 Scanning… {len(mutual_guilds)} mutual so far ({checked}/{total} servers checked)"
+            if status is None:
+                status = await ctx.send(text)
+            else:
+                await status.edit(content=text)
+
+        missing = 0
+        if peers is not None:
+            answers = await peers
+            for answer in answers:
+                mutual_guilds.extend(answer["result"])
+            missing = len(self.cluster.peers) - len(answers)
 
         count = len(mutual_guilds)
         if count == 0:
-            await ctx.send(f"ℹ️ No mutual servers found with `{user_id}`.")
-            return
-
-        if count > 10:
+            text = f"ℹ️ No mutual servers found with `{user_id}`."
+        elif count > 10:
             preview = ', '.join(mutual_guilds[:10])
             more = count - 10
-            await ctx.send(
-                f"🤝 **Mutual Servers:** {count}\n🔹 **First 10:** {preview}... (+{more} more)"
-            )
+            text = f"🤝 **Mutual Servers:** {count}\n🔹 **First 10:** {preview}... (+{more} more)"
+        else:
+            text = f"🤝 **Mutual Servers ({count}):** {', '.join(mutual_guilds)}"
+        if missing:
+            # those workers' servers weren't checked, so the count may be low
+            text += f"\n⚠️ {missing} worker(s) didn't answer; their servers weren't checked."
+
+        if status is None:
+            await ctx.send(text)
         else:
-            await ctx.send(f"🤝 **Mutual Servers ({count}):** {', '.join(mutual_guilds)}")
+            await status.edit(content=text)
 
     # time command
     @commands.hybrid_command(name="time", description="Get the current time in any location.")
@@ -79,16 +163,13 @@ class Misc(commands.Cog):
             await ctx.send("❌ Usage: `-time <city>` — Example: `-time Tokyo`")
             return
 
-        geolocator = Nominatim(user_agent="time-bot")
-        tf = TimezoneFinder()
-
         try:
-            loc = geolocator.geocode(location)
-            if not loc:
+            resolved = await self.resolver.resolve(location)
+            if not resolved:
                 await ctx.send("⚠️ Location not found.")
                 return
 
-            timezone_str = tf.timezone_at(lat=loc.latitude, lng=loc.longitude)
+            _, _, _, timezone_str = resolved
             if not timezone_str:
                 await ctx.send("⚠️ Could not determine timezone for this location.")
                 return
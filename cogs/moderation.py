@@ -2,10 +2,300 @@ from discord.ext import commands
 from discord import app_commands
 import discord
 import asyncio
+import re
+import time
+from datetime import timedelta
+from typing import Optional
+
+from utils.audit import AuditLog
+from utils.bans import BanIndex
+from utils.bulk import BulkResult, parse_ids, read_attachment_ids, resolve_members, run_bulk
+from utils.config import data_path
+from utils.handoff import HANDOFF
+from utils.modconfig import ModConfigStore
+from utils.notify import DMDispatcher
+from utils.purge import PurgeFilter, purge_channel
+from utils.scheduler import PunishmentScheduler
+from utils.warnstore import WarningStore
+
+MAX_PURGE = 5000
+MAX_BULK = 5000
+MAX_TIMEOUT = 28 * 24 * 3600  # Discord's limit for native timeouts
+RENEW_TIMEOUT_EARLY = 24 * 3600  # permanent timeouts are renewed this long before they run out
+RENEWED_NOTE = "\nℹ️ Timeouts last at most 28 days, so permanent ones are renewed automatically until `-unmute`."
+MUTED_OVERWRITE = discord.PermissionOverwrite(
+    send_messages=False, send_messages_in_threads=False, create_public_threads=False,
+    create_private_threads=False, add_reactions=False, speak=False,
+)
+
+
+class PurgeFlags(commands.FlagConverter):
+    user: Optional[discord.User] = commands.flag(default=None, description="Only delete messages from this user")
+    contains: Optional[str] = commands.flag(default=None, description="Only delete messages matching this regex")
+    bots: bool = commands.flag(default=False, description="Only delete messages from bots")
+    attachments: bool = commands.flag(default=False, description="Only delete messages with attachments")
+    minutes: Optional[int] = commands.flag(default=None, description="Only delete messages from the last N minutes")
+    pinned: bool = commands.flag(default=True, description="Also delete pinned messages (pinned: no keeps them)")
+
+
+class BulkFlags(commands.FlagConverter):
+    users: str = commands.flag(default="", description="User IDs or mentions separated by spaces")
+    file: Optional[discord.Attachment] = commands.flag(default=None, description="Text file with one user ID per line")
+    reason: str = commands.flag(default="No reason provided", description="Reason for the action")
+    dm: bool = commands.flag(default=False, description="DM each target first (slower)")
+
+
+class BulkMuteFlags(BulkFlags):
+    duration: Optional[int] = commands.flag(default=None, description="Mute duration in seconds")
+
+
+class ModlogFlags(commands.FlagConverter):
+    moderator: Optional[discord.User] = commands.flag(default=None, description="Only actions by this moderator")
+    target: Optional[discord.User] = commands.flag(default=None, description="Only actions against this user")
+    action: Optional[str] = commands.flag(default=None, description="Only this action, e.g. ban or mute")
+    hours: float = commands.flag(default=24.0, description="How far back to look, in hours")
+
 
 class Moderation(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
+        # on a hot reload, keep the running scheduler/stores/caches of the old cog
+        state = HANDOFF.claim("moderation", owner=self)
+        self._handed_over = state is not None
+        if state is None:
+            state = {
+                # pending timed unmutes/unbans, persisted so they survive restarts
+                "scheduler": PunishmentScheduler(data_path("punishments.db"), wait_ready=bot.wait_until_ready),
+                # per-guild ban lists, loaded lazily and kept current from ban events
+                "bans": BanIndex(),
+                "warnings_store": WarningStore(data_path("warnings.db")),
+                # per-guild settings: muted role id, mute mode, mod-log channel
+                "config": ModConfigStore(data_path("modconfig.json")),
+                # every moderation action, stored and posted to the mod-log channel in batches
+                "audit": AuditLog(data_path("audit.db")),
+                # DMs to moderation targets, with a cache of users whose DMs are closed
+                "notify": DMDispatcher(),
+            }
+        self.scheduler = state["scheduler"]
+        self.bans = state["bans"]
+        self.warnings_store = state["warnings_store"]
+        self.config = state["config"]
+        self.audit = state["audit"]
+        self.notify = state["notify"]
+        # callbacks must point at this instance, not the one being replaced
+        self.scheduler.register("unmute", self._expire_mute)
+        self.scheduler.register("retimeout", self._renew_timeout)
+        self.scheduler.register("unban", self._expire_ban)
+        self.audit.resolve_channel = self._modlog_channel
+        self._role_setup_locks = {}
+        # member lookups honouring the MEMBER_CACHE profile (None outside bot.py)
+        self.members = getattr(bot, "member_cache", None)
+
+    async def cog_load(self):
+        if self._handed_over:
+            return
+        await asyncio.to_thread(self.config.load)
+        await self.scheduler.start()
+        await self.warnings_store.start()
+        await self.audit.start()
+
+    async def _close_state(self):
+        await self.scheduler.close()
+        await self.warnings_store.close()
+        await self.audit.close()
+
+    async def cog_unload(self):
+        if HANDOFF.active:
+            HANDOFF.stash("moderation", {
+                "scheduler": self.scheduler, "bans": self.bans, "warnings_store": self.warnings_store,
+                "config": self.config, "audit": self.audit, "notify": self.notify,
+            }, close=self._close_state)
+            return
+        await self._close_state()
+
+    def _modlog_channel(self, guild_id):
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return None
+        return guild.get_channel(self.config.get(guild_id, "modlog_channel_id") or 0)
+
+    # ban index upkeep
+    @commands.Cog.listener()
+    async def on_member_ban(self, guild, user):
+        self.bans.add(guild.id, user)
+
+    @commands.Cog.listener()
+    async def on_member_unban(self, guild, user):
+        self.bans.remove(guild.id, user.id)
+
+    @commands.Cog.listener()
+    async def on_guild_remove(self, guild):
+        self.bans.drop_guild(guild.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role):
+        if self.config.get(role.guild.id, "muted_role_id") == role.id:
+            await self.config.set(role.guild.id, muted_role_id=None)
+
+    # muting: a cached Muted role per guild, or Discord's native timeout
+    async def get_muted_role(self, guild, *, create=True):
+        role = guild.get_role(self.config.get(guild.id, "muted_role_id") or 0)
+        if role is not None:
+            return role
+        lock = self._role_setup_locks.setdefault(guild.id, asyncio.Lock())
+        try:
+            async with lock:
+                role = guild.get_role(self.config.get(guild.id, "muted_role_id") or 0)
+                if role is not None:
+                    return role
+                # adopt an existing "Muted" role once; afterwards it is found by ID, so renames are fine
+                role = discord.utils.get(guild.roles, name="Muted")
+                if role is None:
+                    if not create:
+                        return None
+                    role = await guild.create_role(name="Muted", reason="Muted role for the mute command")
+                # an adopted role may never have been denied anything
+                await self._apply_mute_overwrites(guild, role)
+                await self.config.set(guild.id, muted_role_id=role.id)
+                return role
+        finally:
+            # every exit path, including the early returns and errors above
+            if self._role_setup_locks.get(guild.id) is lock:
+                del self._role_setup_locks[guild.id]
+
+    async def _apply_mute_overwrites(self, guild, role):
+        # categories plus channels not synced to one: synced channels inherit from their category
+        targets = [
+            ch for ch in guild.channels
+            if isinstance(ch, discord.CategoryChannel) or ch.category is None or not ch.permissions_synced
+        ]
+        result = BulkResult(len(targets))
+        await run_bulk(targets, lambda ch: ch.set_permissions(role, overwrite=MUTED_OVERWRITE, reason="Muted role setup"),
+                       result=result, concurrency=3)
+        print(f"🔇 Muted role set up in {guild.name}: {result.ok}/{result.total} channel overwrites ({result.summary() or 'no failures'})")
+        return result
+
+    def _muted_role_of(self, guild, member):
+        role = guild.get_role(self.config.get(guild.id, "muted_role_id") or 0)
+        return role if role is not None and role in member.roles else None
+
+    def is_muted(self, guild, member):
+        # either kind counts, whatever the current mode: -mutemode may have
+        # changed since this member was muted
+        return member.is_timed_out() or self._muted_role_of(guild, member) is not None
+
+    async def mute_member(self, guild, member, *, duration=None, reason=None, channel_id=None, persist=True):
+        """Mute `member`; returns (kind, entry) for the scheduler job the mute
+        needs, a timed role mute's "unmute" or a permanent timeout's
+        "retimeout" (already persisted unless persist=False), else None."""
+        if self.config.get(guild.id, "mute_mode") == "timeout":
+            # a timed timeout expires on Discord's side; a permanent one is
+            # capped at 28 days, so it's renewed before it runs out
+            await member.timeout(timedelta(seconds=min(duration or MAX_TIMEOUT, MAX_TIMEOUT)), reason=reason)
+            self._member_changed(guild.id, member.id)
+            if duration:
+                if persist:
+                    await self.scheduler.cancel("retimeout", guild.id, member.id)
+                return None
+            entry = (guild.id, member.id, time.time() + MAX_TIMEOUT - RENEW_TIMEOUT_EARLY, {"reason": reason})
+            if persist:
+                await self.scheduler.schedule("retimeout", *entry)
+            return "retimeout", entry
+        role = await self.get_muted_role(guild)
+        await member.add_roles(role, reason=reason)
+        self._member_changed(guild.id, member.id)
+        if not duration:
+            if persist:
+                await self.scheduler.cancel("unmute", guild.id, member.id)
+            return None
+        entry = (guild.id, member.id, time.time() + duration,
+                 {"role_id": role.id, "channel_id": channel_id, "duration": duration})
+        if persist:
+            await self.scheduler.schedule("unmute", *entry)
+        return "unmute", entry
+
+    async def unmute_member(self, guild, member, *, reason=None):
+        role = self._muted_role_of(guild, member)
+        timed_out = member.is_timed_out()
+        if role is None and not timed_out:
+            return False
+        # clear both, so a mute from before a -mutemode switch is lifted too
+        if timed_out:
+            await member.timeout(None, reason=reason)
+        if role is not None:
+            await member.remove_roles(role, reason=reason)
+        self._member_changed(guild.id, member.id)
+        await self.scheduler.cancel("unmute", guild.id, member.id)
+        await self.scheduler.cancel("retimeout", guild.id, member.id)
+        return True
+
+    async def _get_member(self, guild, user_id):
+        if self.members is not None:
+            return await self.members.get_or_fetch(guild, user_id)
+        return guild.get_member(user_id) or await guild.fetch_member(user_id)
+
+    def _member_changed(self, guild_id, user_id):
+        # add_roles/timeout don't update the Member object we hold, and the
+        # gateway never refreshes LRU entries, so drop it to refetch next time
+        if self.members is not None:
+            self.members.forget(guild_id, user_id)
+
+    # timed punishment expiry (called by the scheduler, not a command)
+    async def _expire_mute(self, guild_id, user_id, data):
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+        role = guild.get_role(data["role_id"])
+        try:
+            member = await self._get_member(guild, user_id)
+        except discord.NotFound:
+            return  # left the server
+        if role is None:
+            return
+        # an LRU entry (MEMBER_CACHE=lru) isn't updated by the gateway, so its
+        # roles may predate the mute; only trust the check for gateway-cached
+        # members and otherwise remove by id (a no-op if already gone)
+        if guild.get_member(user_id) is member and role not in member.roles:
+            return
+        await member.remove_roles(role, reason="Timed mute expired")
+        self._member_changed(guild_id, user_id)
+        self.audit.emit(guild_id, "unmute", self.bot.user.id, user_id, "Timed mute expired")
+        self.notify.send(member, f"🔊 You have been unmuted in **{guild.name}**.")
+        channel = guild.get_channel(data.get("channel_id") or 0)
+        if channel is not None:
+            try:
+                await channel.send(f"🔊 Automatically unmuted {member.mention} after `{data['duration']}` seconds.")
+            except (discord.Forbidden, discord.HTTPException):
+                pass
+
+    async def _renew_timeout(self, guild_id, user_id, data):
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+        try:
+            # fetched unless the gateway keeps it current: an LRU entry may
+            # predate a timeout lifted by hand in Discord
+            member = guild.get_member(user_id) or await guild.fetch_member(user_id)
+        except discord.NotFound:
+            return  # left the server
+        if not member.is_timed_out():
+            return
+        await member.timeout(timedelta(seconds=MAX_TIMEOUT), reason=data.get("reason") or "Permanent mute renewed")
+        self._member_changed(guild_id, user_id)
+        await self.scheduler.schedule("retimeout", guild_id, user_id,
+                                      time.time() + MAX_TIMEOUT - RENEW_TIMEOUT_EARLY, data)
+
+    async def _expire_ban(self, guild_id, user_id, data):
+        guild = self.bot.get_guild(guild_id)
+        if guild is None:
+            return
+        try:
+            await guild.unban(discord.Object(id=user_id), reason="Temporary ban expired")
+        except discord.NotFound:
+            return  # already unbanned by hand
+        finally:
+            self.bans.remove(guild_id, user_id)
+        self.audit.emit(guild_id, "unban", self.bot.user.id, user_id, "Temporary ban expired")
 
     # helper: safe reply
     async def safe_reply(self, ctx, content, *, ephemeral=False):
@@ -24,21 +314,66 @@ class Moderation(commands.Cog):
             except:
                 pass
 
+    # helpers for the mass-* commands
+    async def _bulk_targets(self, ctx, flags):
+        ids = parse_ids(flags.users)
+        attachments = list(getattr(ctx.message, "attachments", None) or [])
+        if flags.file is not None:
+            attachments.append(flags.file)
+        ids += await read_attachment_ids(attachments)
+        skip = {ctx.author.id, self.bot.user.id, ctx.guild.owner_id}
+        return [uid for uid in dict.fromkeys(ids) if uid not in skip]
+
+    def _outranks(self, ctx, member):
+        # moderators may only act on members below their own top role
+        if ctx.author.id == ctx.guild.owner_id:
+            return True
+        return ctx.author.top_role > member.top_role
+
+    def _bulk_progress(self, ctx, verb):
+        state = {"message": None, "last": 0.0}
+
+        async def progress(result):
+            if result.done < result.total and result.elapsed - state["last"] < 2:
+                return
+            state["last"] = result.elapsed
+            text = f"⏳ {verb}: `{result.done}`/`{result.total}` processed, `{result.ok}` ok"
+            if state["message"] is None:
+                state["message"] = await ctx.send(text)
+            else:
+                await state["message"].edit(content=text)
+
+        return progress
+
+    async def _bulk_finish(self, ctx, verb, result, action, reason, target_ids, note=""):
+        # one audit event per user actually actioned, committed as one batch
+        self.audit.emit_many(ctx.guild.id, action, ctx.author.id, target_ids, reason)
+        text = f"{verb} **{result.ok}**/{result.total} in {result.elapsed:.1f}s."
+        failures = result.summary()
+        if failures:
+            text += f"\n⚠️ Failed: {failures}"
+        await self.safe_reply(ctx, text + note)
+
+    async def _mass_error(self, ctx, error, usage):
+        if isinstance(error, commands.MissingPermissions):
+            await self.safe_reply(ctx, "❌ You don't have permission to use this command.")
+        elif isinstance(error, commands.BadArgument):
+            await self.safe_reply(ctx, f"❌ Usage: `{usage}`")
+        else:
+            await self.safe_reply(ctx, f"❌ An error occurred: {error}")
+
     # KICK
     @commands.hybrid_command(name="kick", description="Kick a member from the server.")
     @commands.has_permissions(kick_members=True)
     @app_commands.describe(member="The member to kick", reason="Reason for the kick")
     async def kick(self, ctx: commands.Context, member: discord.Member, reason: str = "No reason provided"):
-        try:
-            await member.send(f"👢 You were kicked from **{ctx.guild.name}**.\n**Reason:** {reason}")
-        except discord.Forbidden:
-            await self.safe_reply(ctx, "⚠️ Couldn't DM the user (they probably have DMs off).")
-        except discord.HTTPException:
-            pass
+        # the DM has to land before the kick removes the server we share
+        dm = await self.notify.send(member, f"👢 You were kicked from **{ctx.guild.name}**.\n**Reason:** {reason}")
 
         try:
             await member.kick(reason=reason)
-            await self.safe_reply(ctx, f"👢 Kicked {member.mention} | Reason: {reason}")
+            self.audit.emit(ctx.guild.id, "kick", ctx.author.id, member.id, reason)
+            await self.safe_reply(ctx, f"👢 Kicked {member.mention} | Reason: {reason}" + self.notify.note(dm))
         except discord.Forbidden:
             await self.safe_reply(ctx, "❌ I don't have permission to kick that user.")
         except discord.HTTPException:
@@ -65,20 +400,19 @@ class Moderation(commands.Cog):
             try:
                 user_obj = await self.bot.fetch_user(int(user))
                 await ctx.guild.ban(user_obj, reason=reason)
+                self.audit.emit(ctx.guild.id, "ban", ctx.author.id, user_obj.id, reason)
                 await self.safe_reply(ctx, f"🔨 Banned `{user_obj}` | Reason: {reason}")
                 return
             except Exception as e:
                 await self.safe_reply(ctx, f"❌ Couldn't find user with ID `{user}`. Error: {e}")
                 return
 
-        try:
-            await member.send(f"🔨 You were banned from **{ctx.guild.name}**.\n**Reason:** {reason}")
-        except:
-            pass
+        dm = await self.notify.send(member, f"🔨 You were banned from **{ctx.guild.name}**.\n**Reason:** {reason}")
 
         try:
             await member.ban(reason=reason)
-            await self.safe_reply(ctx, f"🔨 Banned {member.mention} | Reason: {reason}")
+            self.audit.emit(ctx.guild.id, "ban", ctx.author.id, member.id, reason)
+            await self.safe_reply(ctx, f"🔨 Banned {member.mention} | Reason: {reason}" + self.notify.note(dm))
         except discord.Forbidden:
             await self.safe_reply(ctx, "❌ I can't ban that user.")
         except discord.HTTPException:
@@ -93,37 +427,76 @@ class Moderation(commands.Cog):
         else:
             await self.safe_reply(ctx, f"❌ An error occurred: {error}")
 
+    # TEMPBAN
+    @commands.hybrid_command(name="tempban", description="Ban a member for a duration (seconds).")
+    @commands.has_permissions(ban_members=True)
+    @app_commands.describe(member="The member to ban", duration="Duration in seconds", reason="Reason for the ban")
+    async def tempban(self, ctx: commands.Context, member: discord.Member, duration: int, *, reason: str = "No reason provided"):
+        if duration < 1:
+            await self.safe_reply(ctx, "⚠️ Duration must be at least 1 second.")
+            return
+
+        dm = await self.notify.send(
+            member, f"🔨 You were banned from **{ctx.guild.name}** for `{duration}` seconds.\n**Reason:** {reason}")
+
+        try:
+            await member.ban(reason=reason)
+        except discord.Forbidden:
+            await self.safe_reply(ctx, "❌ I can't ban that user.")
+            return
+        except discord.HTTPException:
+            await self.safe_reply(ctx, "⚠️ Ban failed due to a network error.")
+            return
+
+        await self.scheduler.schedule("unban", ctx.guild.id, member.id, time.time() + duration)
+        self.audit.emit(ctx.guild.id, "tempban", ctx.author.id, member.id, reason, duration=f"{duration}s")
+        await self.safe_reply(ctx, f"🔨 Banned {member.mention} for `{duration}` seconds | Reason: {reason}" + self.notify.note(dm))
+
+    @tempban.error
+    async def tempban_error(self, ctx, error):
+        if isinstance(error, commands.MissingRequiredArgument):
+            await self.safe_reply(ctx, "❌ Usage: `-tempban @user <seconds> [reason]`")
+        elif isinstance(error, commands.MissingPermissions):
+            await self.safe_reply(ctx, "❌ You don't have permission to use this command.")
+        else:
+            await self.safe_reply(ctx, f"❌ An error occurred: {error}")
+
     # UNBAN
     @commands.hybrid_command(name="unban", description="Unban a member by tag or ID.")
     @commands.has_permissions(ban_members=True)
     @app_commands.describe(user_input="Name#1234 or user ID of the banned user")
     async def unban(self, ctx: commands.Context, *, user_input: str):
-        banned_users = [entry async for entry in ctx.guild.bans()]
-
-        user_id = None
-        member_name = None
-        discriminator = None
+        user_input = user_input.strip()
 
         if user_input.isdigit():
+            # pure ID: no need to look at the ban list at all
             user_id = int(user_input)
-        elif "#" in user_input:
-            member_name, discriminator = user_input.split("#")
-
-        for ban_entry in banned_users:
-            user = ban_entry.user
-            if (
-                (user_id and user.id == user_id) or
-                (member_name and discriminator and user.name == member_name and user.discriminator == discriminator)
-            ):
-                try:
-                    await user.send(f"✅ You have been unbanned from **{ctx.guild.name}**.")
-                except:
-                    await self.safe_reply(ctx, f"⚠️ Couldn't DM {user}.")
-                await ctx.guild.unban(user)
-                await self.safe_reply(ctx, f"✅ Unbanned {user.mention}")
+            try:
+                await ctx.guild.unban(discord.Object(id=user_id))
+            except discord.NotFound:
+                await self.safe_reply(ctx, "⚠️ User not found in the ban list.")
                 return
-
-        await self.safe_reply(ctx, "⚠️ User not found in the ban list.")
+            user = self.bans.remove(ctx.guild.id, user_id) or self.bot.get_user(user_id)
+        else:
+            matches = await self.bans.find(ctx.guild, user_input)
+            if not matches:
+                await self.safe_reply(ctx, "⚠️ User not found in the ban list.")
+                return
+            if len(matches) > 1:
+                listing = ", ".join(f"`{u}` ({u.id})" for u in matches[:10])
+                await self.safe_reply(ctx, f"⚠️ Several banned users match that name, unban by ID instead: {listing}")
+                return
+            user = matches[0]
+            user_id = user.id
+            await ctx.guild.unban(user)
+            self.bans.remove(ctx.guild.id, user_id)
+
+        await self.scheduler.cancel("unban", ctx.guild.id, user_id)
+        self.audit.emit(ctx.guild.id, "unban", ctx.author.id, user_id)
+        note = ""
+        if user is not None:
+            note = self.notify.note(await self.notify.send(user, f"✅ You have been unbanned from **{ctx.guild.name}**."))
+        await self.safe_reply(ctx, f"✅ Unbanned <@{user_id}>" + note)
 
     @unban.error
     async def unban_error(self, ctx, error):
@@ -139,29 +512,29 @@ class Moderation(commands.Cog):
     @commands.has_permissions(manage_roles=True)
     @app_commands.describe(member="The member to mute", duration="Duration in seconds", reason="Reason for muting")
     async def mute(self, ctx: commands.Context, member: discord.Member, duration: int = None, *, reason: str = "No reason provided"):
-        muted_role = discord.utils.get(ctx.guild.roles, name="Muted")
-
-        if not muted_role:
-            await self.safe_reply(ctx, "❌ 'Muted' role not found.")
+        timeout_mode = self.config.get(ctx.guild.id, "mute_mode") == "timeout"
+        if timeout_mode and duration and duration > MAX_TIMEOUT:
+            await self.safe_reply(ctx, "⚠️ Timeouts can last at most 28 days (2419200 seconds).")
             return
 
-        await member.add_roles(muted_role, reason=reason)
-
+        # the DM goes out alongside the mute rather than before it
+        dm = self.notify.send(member, f"🔇 You have been muted in **{ctx.guild.name}**.\nReason: `{reason}`")
         try:
-            await member.send(f"🔇 You have been muted in **{ctx.guild.name}**.\nReason: `{reason}`")
-        except:
-            await self.safe_reply(ctx, "⚠️ Couldn't DM the muted user.")
-
-        await self.safe_reply(ctx, f"🔇 Muted {member.mention} | Reason: `{reason}`")
+            await self.mute_member(ctx.guild, member, duration=duration, reason=reason, channel_id=ctx.channel.id)
+        except Exception:
+            dm.cancel()
+            raise
+        if duration:
+            self.audit.emit(ctx.guild.id, "mute", ctx.author.id, member.id, reason, duration=f"{duration}s")
+        else:
+            self.audit.emit(ctx.guild.id, "mute", ctx.author.id, member.id, reason)
 
+        note = self.notify.note(await dm)
         if duration:
-            await asyncio.sleep(duration)
-            await member.remove_roles(muted_role)
-            try:
-                await member.send(f"🔊 You have been unmuted in **{ctx.guild.name}**.")
-            except:
-                pass
-            await self.safe_reply(ctx, f"🔊 Automatically unmuted {member.mention} after `{duration}` seconds.")
+            await self.safe_reply(ctx, f"🔇 Muted {member.mention} for `{duration}` seconds | Reason: `{reason}`" + note)
+        else:
+            await self.safe_reply(ctx, f"🔇 Muted {member.mention} | Reason: `{reason}`" + note
+                                  + (RENEWED_NOTE if timeout_mode else ""))
 
     @mute.error
     async def mute_error(self, ctx, error):
@@ -177,24 +550,13 @@ class Moderation(commands.Cog):
     @commands.has_permissions(manage_roles=True)
     @app_commands.describe(member="The member to unmute")
     async def unmute(self, ctx: commands.Context, member: discord.Member):
-        muted_role = discord.utils.get(ctx.guild.roles, name="Muted")
-
-        if not muted_role:
-            await self.safe_reply(ctx, "❌ 'Muted' role not found.")
-            return
-
-        if muted_role not in member.roles:
+        if not await self.unmute_member(ctx.guild, member):
             await self.safe_reply(ctx, f"ℹ️ {member.mention} is not muted.")
             return
+        self.audit.emit(ctx.guild.id, "unmute", ctx.author.id, member.id)
 
-        await member.remove_roles(muted_role)
-
-        try:
-            await member.send(f"🔊 You have been unmuted in **{ctx.guild.name}**.")
-        except:
-            await self.safe_reply(ctx, "⚠️ Couldn't DM the user.")
-
-        await self.safe_reply(ctx, f"🔊 {member.mention} has been unmuted.")
+        dm = await self.notify.send(member, f"🔊 You have been unmuted in **{ctx.guild.name}**.")
+        await self.safe_reply(ctx, f"🔊 {member.mention} has been unmuted." + self.notify.note(dm))
 
     @unmute.error
     async def unmute_error(self, ctx, error):
@@ -205,17 +567,228 @@ class Moderation(commands.Cog):
         else:
             await self.safe_reply(ctx, f"❌ An error occurred: {error}")
 
+    # MUTE SETTINGS
+    @commands.hybrid_command(name="mutemode", description="Choose how mutes work: Muted role or native timeout.")
+    @commands.has_permissions(manage_guild=True)
+    @app_commands.describe(mode="role or timeout")
+    async def mutemode(self, ctx: commands.Context, mode: str = None):
+        if mode is None:
+            await self.safe_reply(ctx, f"ℹ️ Mute mode is `{self.config.get(ctx.guild.id, 'mute_mode')}`.")
+            return
+        mode = mode.lower()
+        if mode not in ("role", "timeout"):
+            await self.safe_reply(ctx, "❌ Usage: `-mutemode role|timeout`")
+            return
+        await self.config.set(ctx.guild.id, mute_mode=mode)
+        await self.safe_reply(ctx, f"✅ Mute mode set to `{mode}`.")
+
+    @mutemode.error
+    async def mutemode_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await self.safe_reply(ctx, "❌ You don't have permission.")
+        else:
+            await self.safe_reply(ctx, f"❌ An error occurred: {error}")
+
+    @commands.hybrid_command(name="muterole", description="Set (or show) the role used for mutes.")
+    @commands.has_permissions(manage_roles=True)
+    @app_commands.describe(role="Existing role to use as the Muted role")
+    async def muterole(self, ctx: commands.Context, role: discord.Role = None):
+        if role is None:
+            current = ctx.guild.get_role(self.config.get(ctx.guild.id, "muted_role_id") or 0)
+            await self.safe_reply(ctx, f"ℹ️ Muted role: {current.mention if current else 'not set (created on first mute)'}")
+            return
+        if ctx.interaction is not None:
+            await ctx.defer()
+        result = await self._apply_mute_overwrites(ctx.guild, role)
+        await self.config.set(ctx.guild.id, muted_role_id=role.id)
+        text = f"✅ Muted role set to {role.mention} ({result.ok}/{result.total} channel overwrites applied)."
+        failures = result.summary()
+        if failures:
+            text += f"\n⚠️ Failed: {failures}"
+        await self.safe_reply(ctx, text)
+
+    @muterole.error
+    async def muterole_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await self.safe_reply(ctx, "❌ You don't have permission.")
+        else:
+            await self.safe_reply(ctx, f"❌ An error occurred: {error}")
+
+    # MASSBAN
+    @commands.hybrid_command(name="massban", description="Ban many users at once by ID or mention.")
+    @commands.has_permissions(ban_members=True)
+    @commands.guild_only()
+    async def massban(self, ctx: commands.Context, *, flags: BulkFlags):
+        ids = await self._bulk_targets(ctx, flags)
+        if not ids:
+            await self.safe_reply(ctx, "❌ Usage: `-massban users: <ids or mentions> [reason: ...] [dm: yes]` (or attach an ID list)")
+            return
+        if len(ids) > MAX_BULK:
+            await self.safe_reply(ctx, f"⚠️ At most {MAX_BULK} users per mass action.")
+            return
+
+        if ctx.interaction is not None:
+            await ctx.defer()
+        result = BulkResult(len(ids))
+        progress = self._bulk_progress(ctx, "Banning")
+
+        members, _ = await resolve_members(ctx.guild, ids, use_gateway=False, cache=self.members)
+        allowed = []
+        for uid in ids:
+            member = members.get(uid)
+            if member is not None and not self._outranks(ctx, member):
+                result.fail("higher role")
+            else:
+                allowed.append(uid)
+
+        if flags.dm:
+            await self.notify.send_many(
+                [members[uid] for uid in allowed if uid in members],
+                f"🔨 You were banned from **{ctx.guild.name}**.\n**Reason:** {flags.reason}",
+            )
+
+        banned_ids = []
+
+        async def ban_one(obj):
+            await ctx.guild.ban(obj, reason=flags.reason, delete_message_seconds=0)
+            banned_ids.append(obj.id)
+
+        # bulk_ban takes up to 200 users per request
+        for i in range(0, len(allowed), 200):
+            chunk = [discord.Object(id=uid) for uid in allowed[i:i + 200]]
+            try:
+                banned = await ctx.guild.bulk_ban(chunk, reason=flags.reason, delete_message_seconds=0)
+            except discord.HTTPException:
+                # e.g. bot lacks Manage Server for bulk bans: fall back to one request per user
+                await run_bulk(chunk, ban_one, result=result, concurrency=5, progress=progress)
+                continue
+            banned_ids.extend(obj.id for obj in banned.banned)
+            result.succeed(len(banned.banned))
+            if banned.failed:
+                result.fail("failed/already banned", len(banned.failed))
+            await progress(result)
+
+        await self._bulk_finish(ctx, "🔨 Banned", result, "massban", flags.reason, banned_ids)
+
+    @massban.error
+    async def massban_error(self, ctx, error):
+        await self._mass_error(ctx, error, "-massban users: <ids or mentions> [reason: ...] [dm: yes]")
+
+    # MASSKICK
+    @commands.hybrid_command(name="masskick", description="Kick many members at once by ID or mention.")
+    @commands.has_permissions(kick_members=True)
+    @commands.guild_only()
+    async def masskick(self, ctx: commands.Context, *, flags: BulkFlags):
+        ids = await self._bulk_targets(ctx, flags)
+        if not ids:
+            await self.safe_reply(ctx, "❌ Usage: `-masskick users: <ids or mentions> [reason: ...] [dm: yes]` (or attach an ID list)")
+            return
+        if len(ids) > MAX_BULK:
+            await self.safe_reply(ctx, f"⚠️ At most {MAX_BULK} users per mass action.")
+            return
+
+        if ctx.interaction is not None:
+            await ctx.defer()
+        result = BulkResult(len(ids))
+        members, missing = await resolve_members(ctx.guild, ids, use_gateway=self.bot.intents.members, cache=self.members)
+        if missing:
+            result.fail("not in server", len(missing))
+        targets = []
+        for member in members.values():
+            if self._outranks(ctx, member):
+                targets.append(member)
+            else:
+                result.fail("higher role")
+
+        if flags.dm:
+            await self.notify.send_many(targets, f"👢 You were kicked from **{ctx.guild.name}**.\n**Reason:** {flags.reason}")
+
+        kicked_ids = []
+
+        async def kick_one(member):
+            await member.kick(reason=flags.reason)
+            kicked_ids.append(member.id)
+
+        await run_bulk(targets, kick_one, result=result, concurrency=5, progress=self._bulk_progress(ctx, "Kicking"))
+        await self._bulk_finish(ctx, "👢 Kicked", result, "masskick", flags.reason, kicked_ids)
+
+    @masskick.error
+    async def masskick_error(self, ctx, error):
+        await self._mass_error(ctx, error, "-masskick users: <ids or mentions> [reason: ...] [dm: yes]")
+
+    # MASSMUTE
+    @commands.hybrid_command(name="massmute", description="Mute many members at once by ID or mention.")
+    @commands.has_permissions(manage_roles=True)
+    @commands.guild_only()
+    async def massmute(self, ctx: commands.Context, *, flags: BulkMuteFlags):
+        ids = await self._bulk_targets(ctx, flags)
+        if not ids:
+            await self.safe_reply(ctx, "❌ Usage: `-massmute users: <ids or mentions> [duration: seconds] [reason: ...] [dm: yes]` (or attach an ID list)")
+            return
+        if len(ids) > MAX_BULK:
+            await self.safe_reply(ctx, f"⚠️ At most {MAX_BULK} users per mass action.")
+            return
+
+        timeout_mode = self.config.get(ctx.guild.id, "mute_mode") == "timeout"
+        if timeout_mode and flags.duration and flags.duration > MAX_TIMEOUT:
+            await self.safe_reply(ctx, "⚠️ Timeouts can last at most 28 days (2419200 seconds).")
+            return
+
+        if ctx.interaction is not None:
+            await ctx.defer()
+        if not timeout_mode:
+            await self.get_muted_role(ctx.guild)  # set it up once, before the workers race for it
+        result = BulkResult(len(ids))
+        members, missing = await resolve_members(ctx.guild, ids, use_gateway=self.bot.intents.members, cache=self.members)
+        if missing:
+            result.fail("not in server", len(missing))
+        targets = []
+        for member in members.values():
+            if self._outranks(ctx, member):
+                targets.append(member)
+            else:
+                result.fail("higher role")
+
+        muted = []
+        jobs = {"unmute": [], "retimeout": []}
+
+        async def mute_one(member):
+            job = await self.mute_member(ctx.guild, member, duration=flags.duration, reason=flags.reason,
+                                         channel_id=ctx.channel.id, persist=False)
+            muted.append(member)
+            if job is not None:
+                jobs[job[0]].append(job[1])
+
+        await run_bulk(targets, mute_one, result=result, concurrency=5, progress=self._bulk_progress(ctx, "Muting"))
+        for kind, entries in jobs.items():
+            await self.scheduler.schedule_many(kind, entries)
+        muted_keys = [(ctx.guild.id, m.id) for m in muted]
+        if not flags.duration:
+            # a permanent mute must not be lifted by an earlier timed mute's unmute
+            await self.scheduler.cancel_many("unmute", muted_keys)
+        elif timeout_mode:
+            # nor a timed timeout extended by an earlier permanent one's renewal
+            await self.scheduler.cancel_many("retimeout", muted_keys)
+        if flags.dm:
+            await self.notify.send_many(muted, f"🔇 You have been muted in **{ctx.guild.name}**.\nReason: `{flags.reason}`")
+
+        note = RENEWED_NOTE if timeout_mode and not flags.duration else ""
+        await self._bulk_finish(ctx, "🔇 Muted", result, "massmute", flags.reason, [m.id for m in muted], note)
+
+    @massmute.error
+    async def massmute_error(self, ctx, error):
+        await self._mass_error(ctx, error, "-massmute users: <ids or mentions> [duration: seconds] [reason: ...] [dm: yes]")
+
     # WARN
     @commands.hybrid_command(name="warn", description="Warn a user.")
     @commands.has_permissions(manage_messages=True)
     @app_commands.describe(member="The user to warn", reason="The reason for the warning")
     async def warn(self, ctx: commands.Context, member: discord.Member, *, reason: str = "No reason provided"):
-        try:
-            await member.send(f"⚠️ You have been warned in **{ctx.guild.name}**.\nReason: `{reason}`")
-        except (discord.Forbidden, discord.HTTPException):
-            await self.safe_reply(ctx, "⚠️ Couldn't DM the warned user.")
+        self.warnings_store.add(ctx.guild.id, member.id, ctx.author.id, reason)
+        self.audit.emit(ctx.guild.id, "warn", ctx.author.id, member.id, reason)
 
-        await self.safe_reply(ctx, f"⚠️ Warned {member.mention} | Reason: `{reason}`")
+        dm = await self.notify.send(member, f"⚠️ You have been warned in **{ctx.guild.name}**.\nReason: `{reason}`")
+        await self.safe_reply(ctx, f"⚠️ Warned {member.mention} | Reason: `{reason}`" + self.notify.note(dm))
 
     @warn.error
     async def warn_error(self, ctx, error):
@@ -226,23 +799,178 @@ class Moderation(commands.Cog):
         else:
             await self.safe_reply(ctx, f"⚠️ Error: {str(error)}")
 
+    # WARNINGS
+    @commands.hybrid_command(name="warnings", description="Show a member's warning history.")
+    @commands.has_permissions(manage_messages=True)
+    @app_commands.describe(member="The member to look up")
+    async def warnings(self, ctx: commands.Context, member: discord.User):
+        count, rows = await self.warnings_store.history(ctx.guild.id, member.id, limit=10)
+        if count == 0:
+            await self.safe_reply(ctx, f"✅ {member.mention} has no warnings.")
+            return
+
+        embed = discord.Embed(
+            title=f"⚠️ Warnings for {member}",
+            description=f"Total: **{count}**" + (" (showing latest 10)" if count > 10 else ""),
+            color=discord.Color.orange()
+        )
+        for moderator_id, reason, created_at in rows:
+            embed.add_field(
+                name=f"<t:{int(created_at)}:f>",
+                value=f"{reason}\nby <@{moderator_id}>",
+                inline=False
+            )
+        await ctx.send(embed=embed)
+
+    @warnings.error
+    async def warnings_error(self, ctx, error):
+        if isinstance(error, commands.MissingRequiredArgument):
+            await self.safe_reply(ctx, "❌ Usage: `-warnings @user`")
+        elif isinstance(error, commands.MissingPermissions):
+            await self.safe_reply(ctx, "❌ You don't have permission.")
+        else:
+            await self.safe_reply(ctx, f"⚠️ Error: {str(error)}")
+
+    # CLEARWARNS
+    @commands.hybrid_command(name="clearwarns", description="Clear all warnings for a member.")
+    @commands.has_permissions(manage_messages=True)
+    @app_commands.describe(member="The member whose warnings to clear")
+    async def clearwarns(self, ctx: commands.Context, member: discord.User):
+        removed = await self.warnings_store.clear(ctx.guild.id, member.id)
+        await self.safe_reply(ctx, f"🧽 Cleared `{removed}` warning(s) for {member.mention}.")
+
+    @clearwarns.error
+    async def clearwarns_error(self, ctx, error):
+        if isinstance(error, commands.MissingRequiredArgument):
+            await self.safe_reply(ctx, "❌ Usage: `-clearwarns @user`")
+        elif isinstance(error, commands.MissingPermissions):
+            await self.safe_reply(ctx, "❌ You don't have permission.")
+        else:
+            await self.safe_reply(ctx, f"⚠️ Error: {str(error)}")
+
+    # MOD LOG
+    @commands.hybrid_command(name="setmodlog", description="Set (or clear) the channel moderation actions are logged to.")
+    @commands.has_permissions(manage_guild=True)
+    @app_commands.describe(channel="Channel for the mod log; leave empty to turn it off")
+    async def setmodlog(self, ctx: commands.Context, channel: discord.TextChannel = None):
+        await self.config.set(ctx.guild.id, modlog_channel_id=channel.id if channel else None)
+        if channel is None:
+            await self.safe_reply(ctx, "✅ Mod log turned off (actions are still recorded for `-modlog`).")
+        else:
+            await self.safe_reply(ctx, f"✅ Moderation actions will be logged to {channel.mention}.")
+
+    @setmodlog.error
+    async def setmodlog_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await self.safe_reply(ctx, "❌ You don't have permission.")
+        else:
+            await self.safe_reply(ctx, f"❌ An error occurred: {error}")
+
+    @commands.hybrid_command(name="modlog", description="Search recorded moderation actions.")
+    @commands.has_permissions(manage_messages=True)
+    @commands.guild_only()
+    async def modlog(self, ctx: commands.Context, *, flags: ModlogFlags):
+        events = await self.audit.query(
+            ctx.guild.id,
+            moderator_id=flags.moderator.id if flags.moderator else None,
+            target_id=flags.target.id if flags.target else None,
+            action=flags.action.lower() if flags.action else None,
+            since=time.time() - flags.hours * 3600,
+            limit=25,
+        )
+        if not events:
+            await self.safe_reply(ctx, f"ℹ️ No matching actions in the last {flags.hours:g}h.")
+            return
+        embed = discord.Embed(
+            title=f"📜 Moderation actions (last {flags.hours:g}h)",
+            description="\n".join(e.line() for e in events)[:4000],
+            color=discord.Color.dark_grey(),
+        )
+        if len(events) == 25:
+            embed.set_footer(text="Showing the newest 25; narrow the filters to see more.")
+        await ctx.send(embed=embed)
+
+    @modlog.error
+    async def modlog_error(self, ctx, error):
+        if isinstance(error, commands.MissingPermissions):
+            await self.safe_reply(ctx, "❌ You don't have permission.")
+        elif isinstance(error, commands.BadArgument):
+            await self.safe_reply(ctx, "❌ Usage: `-modlog [moderator: @user] [target: @user] [action: ban] [hours: 24]`")
+        else:
+            await self.safe_reply(ctx, f"❌ An error occurred: {error}")
+
     # PURGE
-    @commands.hybrid_command(name="purge", description="Delete bulk messages.")
+    @commands.hybrid_command(name="purge", description="Delete bulk messages, optionally filtered.")
     @commands.has_permissions(manage_messages=True)
-    @app_commands.describe(amount="Number of messages to delete (1–100)")
-    async def purge(self, ctx: commands.Context, amount: int):
-        if amount < 1 or amount > 100:
-            await self.safe_reply(ctx, "⚠️ Choose a number between 1–100.")
+    @app_commands.describe(amount=f"Number of messages to delete (1–{MAX_PURGE})")
+    async def purge(self, ctx: commands.Context, amount: int, *, flags: PurgeFlags):
+        if amount < 1 or amount > MAX_PURGE:
+            await self.safe_reply(ctx, f"⚠️ Choose a number between 1–{MAX_PURGE}.")
+            return
+
+        try:
+            check = PurgeFilter(
+                author_ids=[flags.user.id] if flags.user else None,
+                pattern=flags.contains,
+                attachments=flags.attachments,
+                bots=flags.bots,
+                pinned=flags.pinned,
+            )
+        except re.error as e:
+            await self.safe_reply(ctx, f"⚠️ Invalid `contains` pattern: {e}")
             return
 
-        await ctx.channel.purge(limit=amount + 1)
-        confirm = await ctx.send(f"🧹 Deleted `{amount}` messages.")
-        await confirm.delete(delay=3)
+        after = None
+        if flags.minutes:
+            after = discord.utils.utcnow() - timedelta(minutes=flags.minutes)
+
+        if ctx.interaction is None:
+            before = ctx.message
+            try:
+                await ctx.message.delete()
+            except (discord.Forbidden, discord.NotFound, discord.HTTPException):
+                pass
+        else:
+            await ctx.defer(ephemeral=True)
+            before = None
+
+        status = None
+        last_update = 0.0
+
+        async def progress(result):
+            nonlocal status, last_update
+            # large purges: show a running count, edited at most every 3s
+            if amount <= 100 or result.elapsed - last_update < 3:
+                return
+            last_update = result.elapsed
+            text = f"🧹 Purging… `{result.deleted}`/`{amount}` deleted ({result.scanned} scanned)"
+            if status is None:
+                status = await ctx.channel.send(text)
+            else:
+                await status.edit(content=text)
+
+        result = await purge_channel(ctx.channel, limit=amount, check=check, before=before, after=after, progress=progress)
+        self.audit.emit(ctx.guild.id, "purge", ctx.author.id, flags.user.id if flags.user else None,
+                        messages=result.deleted, channel=ctx.channel.mention)
+
+        summary = (
+            f"🧹 Deleted `{result.deleted}` messages (scanned {result.scanned}) "
+            f"in {result.elapsed:.1f}s — {result.rate:.1f} msg/s."
+        )
+        if result.aborted:
+            summary += f"\n⚠️ Stopped early: the `contains` {result.aborted}."
+        if status is not None:
+            await status.delete()
+        if ctx.interaction is not None:
+            await ctx.send(summary, ephemeral=True)
+        else:
+            confirm = await ctx.send(summary)
+            await confirm.delete(delay=5)
 
     @purge.error
     async def purge_error(self, ctx, error):        
         if isinstance(error, commands.MissingRequiredArgument):
-            await self.safe_reply(ctx, "❌ Usage: `-purge [1–100]`")
+            await self.safe_reply(ctx, f"❌ Usage: `-purge [1–{MAX_PURGE}] [user: @user] [contains: regex] [bots: yes] [attachments: yes] [minutes: N] [pinned: no]`")
         elif isinstance(error, commands.MissingPermissions):
             await self.safe_reply(ctx, "❌ You don't have permission.")
         else:
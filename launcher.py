@@ -0,0 +1,113 @@
+# launcher.py (run the bot as several worker processes, each owning a slice of shards)
+#
+#   python launcher.py --workers 4            # shard count from Discord's recommendation
+#   python launcher.py --workers 2 --shards 8
+#
+# Each worker is a normal `python bot.py` with SHARD_COUNT/SHARD_IDS set, its
+# own health port (PORT + worker index) and the other workers as CLUSTER_PEERS.
+# Workers keep their SQLite stores and modconfig.json in DATA_DIR/worker-N so
+# they don't overwrite each other's files. A guild's state follows its shard, so
+# keep --workers/--shards fixed once a deployment has data.
+import argparse
+import asyncio
+import os
+import secrets
+import signal
+import sys
+
+import aiohttp
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+async def recommended_shards(token):
+    async with aiohttp.ClientSession() as session:
+        async with session.get("https://discord.com/api/v10/gateway/bot",
+                               headers={"Authorization": f"Bot {token}"}) as resp:
+            resp.raise_for_status()
+            return (await resp.json())["shards"]
+
+
+def split_shards(shard_count, workers):
+    # contiguous ranges, as even as possible: 10 shards / 3 workers -> 0-3, 4-6, 7-9
+    ranges = []
+    start = 0
+    for i in range(workers):
+        size = shard_count // workers + (1 if i < shard_count % workers else 0)
+        if size:
+            ranges.append((start, start + size - 1))
+        start += size
+    return ranges
+
+
+async def run_worker(index, env, stopping):
+    backoff = 1
+    while not stopping.is_set():
+        print(f"🚀 worker {index}: starting shards {env['SHARD_IDS']}", flush=True)
+        proc = await asyncio.create_subprocess_exec(sys.executable, "bot.py", env=env)
+        waiter = asyncio.create_task(proc.wait())
+        stopper = asyncio.create_task(stopping.wait())
+        await asyncio.wait({waiter, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        if stopping.is_set():
+            if proc.returncode is None:
+                proc.terminate()
+                await waiter
+            stopper.cancel()
+            return
+        stopper.cancel()
+        print(f"⚠️ worker {index} exited with {proc.returncode}; restarting in {backoff}s", flush=True)
+        await asyncio.sleep(backoff)
+        backoff = min(backoff * 2, 60)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run the bot across several shard worker processes.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--shards", type=int, help="total shard count (default: Discord's recommendation)")
+    parser.add_argument("--base-port", type=int, default=int(os.getenv("PORT", "8080")))
+    args = parser.parse_args()
+
+    token = os.getenv("DISCORD_TOKEN")
+    if not token:
+        print("❌ DISCORD_TOKEN not found", flush=True)
+        raise SystemExit(1)
+
+    shard_count = args.shards or await recommended_shards(token)
+    ranges = split_shards(shard_count, max(1, min(args.workers, shard_count)))
+    ports = [args.base_port + i for i in range(len(ranges))]
+    cluster_token = os.getenv("CLUSTER_TOKEN") or secrets.token_hex(16)
+    data_dir = os.getenv("DATA_DIR", "data")
+    print(f">> {shard_count} shard(s) across {len(ranges)} worker(s): {ranges}", flush=True)
+
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except NotImplementedError:  # Windows
+            pass
+
+    workers = []
+    for i, (lo, hi) in enumerate(ranges):
+        env = dict(
+            os.environ,
+            SHARD_COUNT=str(shard_count),
+            SHARD_IDS=f"{lo}-{hi}",
+            CLUSTER_ID=str(i),
+            CLUSTER_TOKEN=cluster_token,
+            CLUSTER_PEERS=",".join(f"http://127.0.0.1:{p}" for j, p in enumerate(ports) if j != i),
+            PORT=str(ports[i]),
+            DATA_DIR=os.path.join(data_dir, f"worker-{i}"),
+            # only one worker needs to push the command tree
+            SYNC_COMMANDS="1" if i == 0 else "0",
+        )
+        workers.append(asyncio.create_task(run_worker(i, env, stopping)))
+    await asyncio.gather(*workers)
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
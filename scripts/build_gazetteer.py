@@ -0,0 +1,87 @@
+# scripts/build_gazetteer.py
+# Builds data/gazetteer.tsv for utils/gazetteer.py.
+#
+#   python scripts/build_gazetteer.py                      # from data/places.csv
+#   python scripts/build_gazetteer.py --geonames cities15000.txt
+#
+# --geonames takes a GeoNames "cities" dump (https://download.geonames.org/export/dump/)
+# and may be combined with the curated CSV; curated rows always rank first.
+import argparse
+import csv
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.gazetteer import DEFAULT_INDEX, normalize_key
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def read_places_csv(path):
+    with open(path, encoding="utf-8", newline="") as f:
+        for row in csv.DictReader(f):
+            aliases = [a for a in row["aliases"].split("|") if a]
+            yield row["name"], aliases, float(row["lat"]), float(row["lng"]), row["tz"]
+
+
+def read_geonames(path, min_population):
+    # columns: 1 name, 2 asciiname, 3 alternatenames, 4 lat, 5 lng, 14 population, 17 timezone
+    rows = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            cols = line.rstrip("\n").split("\t")
+            if len(cols) < 18 or not cols[17]:
+                continue
+            population = int(cols[14] or 0)
+            if population < min_population:
+                continue
+            aliases = [cols[2]] + [a for a in cols[3].split(",") if a]
+            rows.append((population, (cols[1], aliases, float(cols[4]), float(cols[5]), cols[17])))
+    rows.sort(key=lambda r: -r[0])
+    for _, place in rows:
+        yield place
+
+
+def build(places):
+    entries = {}
+    zones = {}
+    for rank, (name, aliases, lat, lng, tz) in enumerate(places):
+        zone = zones.setdefault(tz, len(zones))
+        for label in [name, *aliases]:
+            key = normalize_key(label)
+            # first (highest ranked) place keeps an ambiguous alias
+            if key and key not in entries:
+                entries[key] = (name, lat, lng, rank, zone)
+    return entries, zones
+
+
+def write(entries, zones, out):
+    ordered_zones = sorted(zones, key=zones.get)
+    with open(out, "w", encoding="utf-8", newline="\n") as f:
+        f.write("#zones\t" + "\t".join(ordered_zones) + "\n")
+        for key in sorted(entries):
+            name, lat, lng, rank, zone = entries[key]
+            f.write(f"{key}\t{name}\t{lat:.4f}\t{lng:.4f}\t{rank}\t{zone}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the offline gazetteer index.")
+    parser.add_argument("--places", default=os.path.join(ROOT, "data", "places.csv"))
+    parser.add_argument("--geonames", help="GeoNames cities dump to merge in")
+    parser.add_argument("--min-population", type=int, default=100000)
+    parser.add_argument("--out", default=DEFAULT_INDEX)
+    args = parser.parse_args()
+
+    def places():
+        yield from read_places_csv(args.places)
+        if args.geonames:
+            yield from read_geonames(args.geonames, args.min_population)
+
+    entries, zones = build(places())
+    write(entries, zones, args.out)
+    print(f"✅ Wrote {len(entries)} keys across {len(zones)} zones to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# tests/ - unit tests; run with python -m pytest -q
@@ -0,0 +1,113 @@
+# tests/test_scheduler.py
+import asyncio
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+
+from utils.scheduler import PunishmentScheduler
+
+
+def _rows(path):
+    db = sqlite3.connect(path)
+    try:
+        return db.execute("SELECT kind, guild_id, user_id, expires_at FROM punishments").fetchall()
+    finally:
+        db.close()
+
+
+class SchedulerRetryTests(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "punishments.db")
+        self.sched = PunishmentScheduler(self.path, max_attempts=3, retry_delay=0.05)
+        self.calls = []
+
+    async def asyncTearDown(self):
+        await self.sched.close()
+        self.tmp.cleanup()
+
+    async def _wait_for(self, predicate, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            if time.monotonic() > deadline:
+                self.fail("condition not reached in time")
+            await asyncio.sleep(0.01)
+
+    async def test_failed_handler_keeps_row_and_retries(self):
+        async def handler(guild_id, user_id, data):
+            self.calls.append(time.time())
+            if len(self.calls) < 2:
+                raise RuntimeError("discord is down")
+
+        self.sched.register("mute", handler)
+        await self.sched.start()
+        first_due = time.time()
+        await self.sched.schedule("mute", 1, 2, first_due, {"role_id": 3})
+
+        await self._wait_for(lambda: len(self.calls) == 1)
+        await asyncio.sleep(0.02)
+        rows = _rows(self.path)
+        self.assertEqual(len(rows), 1, "row must survive a failed handler")
+        self.assertGreater(rows[0][3], first_due, "row must be pushed back")
+        self.assertIsNotNone(self.sched.pending("mute", 1, 2))
+
+        await self._wait_for(lambda: len(self.calls) == 2)
+        await self._wait_for(lambda: not _rows(self.path))
+        self.assertIsNone(self.sched.pending("mute", 1, 2))
+
+    async def test_gives_up_after_max_attempts(self):
+        async def handler(guild_id, user_id, data):
+            self.calls.append(time.time())
+            raise RuntimeError("always broken")
+
+        self.sched.register("ban", handler)
+        await self.sched.start()
+        await self.sched.schedule("ban", 1, 2, time.time())
+
+        await self._wait_for(lambda: len(self.calls) == 3)
+        await self._wait_for(lambda: not _rows(self.path))
+        await asyncio.sleep(0.3)
+        self.assertEqual(len(self.calls), 3)
+        self.assertIsNone(self.sched.pending("ban", 1, 2))
+        # backoff doubles between attempts
+        self.assertGreater(self.calls[2] - self.calls[1], self.calls[1] - self.calls[0])
+
+    async def test_rows_survive_restart_after_failure(self):
+        async def handler(guild_id, user_id, data):
+            raise RuntimeError("discord is down")
+
+        self.sched.retry_delay = 60.0
+        self.sched.register("mute", handler)
+        await self.sched.start()
+        await self.sched.schedule("mute", 1, 2, time.time())
+        await self._wait_for(lambda: (self.sched.pending("mute", 1, 2) or 0) > time.time() + 30)
+        await self.sched.close()
+
+        restarted = PunishmentScheduler(self.path)
+        await restarted.start()
+        try:
+            self.assertIsNotNone(restarted.pending("mute", 1, 2))
+        finally:
+            await restarted.close()
+
+    async def test_cancel_many_drops_rows_and_timers(self):
+        async def handler(guild_id, user_id, data):
+            self.calls.append(user_id)
+
+        self.sched.register("unmute", handler)
+        await self.sched.start()
+        due = time.time() + 0.3
+        await self.sched.schedule_many("unmute", [(1, u, due, None) for u in (2, 3, 4)])
+
+        cancelled = await self.sched.cancel_many("unmute", [(1, 2), (1, 3), (1, 99)])
+        self.assertEqual(cancelled, 2)
+        self.assertEqual([row[2] for row in _rows(self.path)], [4])
+        await self._wait_for(lambda: self.calls)
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.calls, [4])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1 @@
+# utils/ - shared services used by the cogs (not loaded as extensions)
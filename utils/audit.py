@@ -0,0 +1,182 @@
+# utils/audit.py (moderation audit trail: queued events -> SQLite + batched mod-log posts)
+import asyncio
+import json
+import time
+
+import discord
+
+from utils.sqlitestore import QueuedSQLiteStore
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS audit ("
+    " id INTEGER PRIMARY KEY,"
+    " guild_id INTEGER NOT NULL, action TEXT NOT NULL,"
+    " moderator_id INTEGER, target_id INTEGER, reason TEXT,"
+    " created_at REAL NOT NULL, extra TEXT)",
+    "CREATE INDEX IF NOT EXISTS audit_guild ON audit (guild_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS audit_target ON audit (guild_id, target_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS audit_moderator ON audit (guild_id, moderator_id, created_at)",
+)
+
+ACTION_EMOJI = {
+    "kick": "👢", "ban": "🔨", "tempban": "🔨", "unban": "✅", "mute": "🔇", "unmute": "🔊",
+    "warn": "⚠️", "purge": "🧹", "massban": "🔨", "masskick": "👢", "massmute": "🔇", "automod": "🤖",
+}
+EMBED_CHARS = 4000     # embed descriptions max out at 4096
+MESSAGE_CHARS = 5800   # all embeds of one message share a 6000 char budget
+
+
+class AuditEvent:
+    __slots__ = ("guild_id", "action", "moderator_id", "target_id", "reason", "created_at", "extra")
+
+    def __init__(self, guild_id, action, moderator_id, target_id, reason, created_at, extra):
+        self.guild_id = guild_id
+        self.action = action
+        self.moderator_id = moderator_id
+        self.target_id = target_id
+        self.reason = reason
+        self.created_at = created_at
+        self.extra = extra
+
+    def line(self):
+        parts = [f"{ACTION_EMOJI.get(self.action, '•')} **{self.action}**"]
+        if self.target_id:
+            parts.append(f"<@{self.target_id}>")
+        if self.moderator_id:
+            parts.append(f"by <@{self.moderator_id}>")
+        details = ", ".join(f"{k}: {v}" for k, v in (self.extra or {}).items())
+        if details:
+            parts.append(f"({details})")
+        if self.reason:
+            parts.append(f"— {self.reason[:200]}")
+        parts.append(f"<t:{int(self.created_at)}:T>")
+        return " ".join(parts)
+
+
+def build_embeds(events, *, max_lines=100):
+    """One embed per ~4000 chars of event lines; bursts past `max_lines` are
+    summarised instead of posted line by line."""
+    lines = [e.line() for e in events[:max_lines]]
+    if len(events) > max_lines:
+        lines.append(f"…and **{len(events) - max_lines}** more (see `-modlog`)")
+    embeds = []
+    text = ""
+    for line in lines:
+        if text and len(text) + len(line) + 1 > EMBED_CHARS:
+            embeds.append(text)
+            text = ""
+        text = f"{text}\n{line}" if text else line
+    if text:
+        embeds.append(text)
+    title = "Moderation log" if len(events) > 1 else f"Moderation: {events[0].action}"
+    return [discord.Embed(title=title if i == 0 else None, description=d, color=discord.Color.dark_grey())
+            for i, d in enumerate(embeds)]
+
+
+class AuditLog(QueuedSQLiteStore):
+    """Append-only record of moderation actions.
+
+    `emit` only enqueues, so commands never wait on it. One writer task
+    commits whatever has queued up in a single transaction, then hands the
+    events to a per-guild poster that waits `linger` seconds and posts the
+    whole burst to the mod-log channel as one message.
+    """
+
+    SCHEMA = SCHEMA
+    label = "Audit log"
+
+    def __init__(self, path, *, resolve_channel=None, batch_size=500, linger=2.0):
+        super().__init__(path, batch_size=batch_size)
+        self.resolve_channel = resolve_channel  # guild_id -> channel or None
+        self.linger = linger
+        self._pending = {}   # guild_id -> [AuditEvent] waiting to be posted
+        self._posters = {}   # guild_id -> task
+
+    async def _closing(self):
+        # post what's still lingering rather than dropping it
+        for task in list(self._posters.values()):
+            task.cancel()
+        for guild_id in list(self._pending):
+            await self._post(guild_id)
+        self._posters.clear()
+
+    # ---- writes (queued) ----
+    def emit(self, guild_id, action, moderator_id=None, target_id=None, reason=None, **extra):
+        self._enqueue(AuditEvent(guild_id, action, moderator_id, target_id, reason, time.time(), extra))
+
+    def emit_many(self, guild_id, action, moderator_id, target_ids, reason=None, **extra):
+        # one event per target (so -modlog target: finds them); the writer
+        # commits the whole burst in one transaction
+        now = time.time()
+        for target_id in target_ids:
+            self._enqueue(AuditEvent(guild_id, action, moderator_id, target_id, reason, now, extra))
+
+    def _apply(self, events):
+        self._writer.executemany(
+            "INSERT INTO audit (guild_id, action, moderator_id, target_id, reason, created_at, extra)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [(e.guild_id, e.action, e.moderator_id, e.target_id, e.reason, e.created_at,
+              json.dumps(e.extra) if e.extra else None) for e in events],
+        )
+        self._writer.commit()
+        return [None] * len(events)
+
+    def _written(self, events):
+        if self.resolve_channel is None:
+            return
+        for event in events:
+            self._pending.setdefault(event.guild_id, []).append(event)
+            if event.guild_id not in self._posters:
+                self._posters[event.guild_id] = asyncio.create_task(self._post_later(event.guild_id))
+
+    # ---- mod-log channel ----
+    async def _post_later(self, guild_id):
+        await asyncio.sleep(self.linger)
+        self._posters.pop(guild_id, None)
+        await self._post(guild_id)
+
+    async def _post(self, guild_id):
+        events = self._pending.pop(guild_id, None)
+        if not events:
+            return
+        channel = self.resolve_channel(guild_id)
+        if channel is None:
+            return
+        batch = []
+        size = 0
+        try:
+            for embed in build_embeds(events):
+                length = len(embed)
+                if batch and (len(batch) == 10 or size + length > MESSAGE_CHARS):
+                    await channel.send(embeds=batch)
+                    batch, size = [], 0
+                batch.append(embed)
+                size += length
+            if batch:
+                await channel.send(embeds=batch)
+        except (discord.Forbidden, discord.HTTPException) as e:
+            print(f"⚠️ Couldn't post to the mod-log channel in guild {guild_id}:", repr(e))
+
+    # ---- reads ----
+    @staticmethod
+    def _query_sync(db, guild_id, moderator_id, target_id, action, since, until, limit):
+        sql = "SELECT action, moderator_id, target_id, reason, created_at, extra FROM audit WHERE guild_id=?"
+        params = [guild_id]
+        for column, value in (("moderator_id", moderator_id), ("target_id", target_id), ("action", action)):
+            if value is not None:
+                sql += f" AND {column}=?"
+                params.append(value)
+        if since is not None:
+            sql += " AND created_at>=?"
+            params.append(since)
+        if until is not None:
+            sql += " AND created_at<?"
+            params.append(until)
+        sql += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        rows = db.execute(sql, params).fetchall()
+        return [AuditEvent(guild_id, a, m, t, r, c, json.loads(x) if x else {}) for a, m, t, r, c, x in rows]
+
+    async def query(self, guild_id, *, moderator_id=None, target_id=None, action=None, since=None, until=None, limit=20):
+        """Newest-first events for a guild, optionally filtered."""
+        return await self._read(self._query_sync, guild_id, moderator_id, target_id, action, since, until, limit)
@@ -0,0 +1,87 @@
+# utils/bans.py (per-guild ban list index for the unban command)
+import asyncio
+
+
+class GuildBans:
+    __slots__ = ("by_id", "by_name", "loaded")
+
+    def __init__(self):
+        self.by_id = {}    # user id -> discord.User
+        self.by_name = {}  # "name" / "name#1234" (lowercased) -> set of user ids
+        self.loaded = False
+
+    @staticmethod
+    def _names(user):
+        name = user.name.lower()
+        if user.discriminator and user.discriminator != "0":
+            return (name, f"{name}#{user.discriminator}")
+        return (name,)
+
+    def add(self, user):
+        self.remove(user.id)
+        self.by_id[user.id] = user
+        for key in self._names(user):
+            self.by_name.setdefault(key, set()).add(user.id)
+
+    def remove(self, user_id):
+        user = self.by_id.pop(user_id, None)
+        if user is None:
+            return None
+        for key in self._names(user):
+            ids = self.by_name.get(key)
+            if ids:
+                ids.discard(user_id)
+                if not ids:
+                    del self.by_name[key]
+        return user
+
+
+class BanIndex:
+    """Ban lists keyed by user id and lowercased name, one per guild.
+
+    A guild's list is downloaded once, the first time a name lookup needs
+    it, and is then kept current from member ban/unban events.
+    """
+
+    def __init__(self):
+        self._guilds = {}
+        self._locks = {}
+
+    def _get(self, guild_id):
+        bans = self._guilds.get(guild_id)
+        if bans is None:
+            bans = self._guilds[guild_id] = GuildBans()
+        return bans
+
+    async def ensure(self, guild):
+        bans = self._get(guild.id)
+        if bans.loaded:
+            return bans
+        lock = self._locks.setdefault(guild.id, asyncio.Lock())
+        async with lock:
+            if not bans.loaded:
+                async for entry in guild.bans(limit=None):
+                    bans.add(entry.user)
+                bans.loaded = True
+        self._locks.pop(guild.id, None)
+        return bans
+
+    def add(self, guild_id, user):
+        self._get(guild_id).add(user)
+
+    def remove(self, guild_id, user_id):
+        bans = self._guilds.get(guild_id)
+        return bans.remove(user_id) if bans else None
+
+    def get(self, guild_id, user_id):
+        bans = self._guilds.get(guild_id)
+        return bans.by_id.get(user_id) if bans else None
+
+    def drop_guild(self, guild_id):
+        self._guilds.pop(guild_id, None)
+
+    async def find(self, guild, text):
+        """Banned users matching `name` or `name#1234` (case-insensitive)."""
+        bans = await self.ensure(guild)
+        ids = bans.by_name.get(text.strip().lower(), ())
+        return [bans.by_id[i] for i in ids]
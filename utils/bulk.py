@@ -0,0 +1,113 @@
+# utils/bulk.py (target parsing + bounded worker pool for mass moderation)
+import asyncio
+import re
+import time
+
+ID_RE = re.compile(r"<@!?(\d{15,20})>|\b(\d{15,20})\b")
+MAX_ATTACHMENT_BYTES = 1024 * 1024
+
+
+def parse_ids(text):
+    """User IDs from mentions/raw IDs in `text`, de-duplicated, in order."""
+    seen = {}
+    for mention, raw in ID_RE.findall(text or ""):
+        seen.setdefault(int(mention or raw), None)
+    return list(seen)
+
+
+async def read_attachment_ids(attachments):
+    # plain-text ID lists (one per line, comma or space separated)
+    ids = []
+    for attachment in attachments:
+        if attachment is None or attachment.size > MAX_ATTACHMENT_BYTES:
+            continue
+        data = await attachment.read()
+        ids.extend(parse_ids(data.decode("utf-8", errors="ignore")))
+    return ids
+
+
+async def resolve_members(guild, user_ids, *, use_gateway=True, cache=None):
+    """Split `user_ids` into ({id: Member}, [ids not in the guild]).
+
+    The member cache (or a utils.members.MemberCache, if given) is checked
+    first; the rest are looked up 100 at a time over the gateway (members
+    intent) instead of one REST call each.
+    """
+    found = {}
+    missing = []
+    for uid in user_ids:
+        member = cache.get(guild, uid) if cache is not None else guild.get_member(uid)
+        if member is not None:
+            found[uid] = member
+        else:
+            missing.append(uid)
+
+    if missing and use_gateway:
+        for i in range(0, len(missing), 100):
+            chunk = missing[i:i + 100]
+            for member in await guild.query_members(user_ids=chunk, limit=len(chunk), cache=False):
+                found[member.id] = member
+        missing = [uid for uid in missing if uid not in found]
+    return found, missing
+
+
+class BulkResult:
+    __slots__ = ("total", "done", "ok", "failures", "started")
+
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.ok = 0
+        self.failures = {}  # error label -> count
+        self.started = time.perf_counter()
+
+    def fail(self, label, count=1):
+        self.failures[label] = self.failures.get(label, 0) + count
+        self.done += count
+
+    def succeed(self, count=1):
+        self.ok += count
+        self.done += count
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def summary(self):
+        if not self.failures:
+            return ""
+        return ", ".join(f"{label}: {count}" for label, count in sorted(self.failures.items(), key=lambda kv: -kv[1]))
+
+
+def error_label(error):
+    name = type(error).__name__
+    return {"Forbidden": "forbidden", "NotFound": "not found"}.get(name, name)
+
+
+async def run_bulk(items, action, *, result, concurrency=5, progress=None):
+    """Await `action(item)` for every item with at most `concurrency` in flight.
+
+    discord.py already queues each request on its route's rate-limit bucket;
+    the pool just keeps enough requests queued to use the bucket fully
+    without piling up thousands of waiting tasks.
+    """
+    queue = asyncio.Queue()
+    for item in items:
+        queue.put_nowait(item)
+
+    async def worker():
+        while True:
+            try:
+                item = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            try:
+                await action(item)
+                result.succeed()
+            except Exception as e:
+                result.fail(error_label(e))
+            if progress is not None:
+                await progress(result)
+
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, len(items))))))
+    return result
@@ -0,0 +1,93 @@
+# utils/cluster.py (shard config + cross-process queries between launcher workers)
+import asyncio
+import hmac
+import os
+
+import aiohttp
+from aiohttp import web
+
+
+def parse_shard_ids(text):
+    """"0-3,6" -> [0, 1, 2, 3, 6]; empty/None -> None."""
+    if not text:
+        return None
+    ids = []
+    for part in text.split(","):
+        part = part.strip()
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            ids.extend(range(int(lo), int(hi) + 1))
+        elif part:
+            ids.append(int(part))
+    return ids
+
+
+class Cluster:
+    """Lets a worker answer and ask questions of the other shard workers.
+
+    Each worker serves POST /cluster/<name> on its health server; handlers
+    registered with `register` answer with JSON. `gather` asks every peer in
+    CLUSTER_PEERS and returns the answers that arrived in time; callers can
+    compare against len(peers) to report workers that didn't answer. With no
+    peers configured (single process) `gather` returns [] immediately.
+    """
+
+    def __init__(self, *, cluster_id=0, peers=(), token=None):
+        self.cluster_id = cluster_id
+        self.peers = [p.rstrip("/") for p in peers if p]
+        self.token = token or ""
+        self._handlers = {}
+        self._session = None
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            cluster_id=int(os.getenv("CLUSTER_ID", "0")),
+            peers=os.getenv("CLUSTER_PEERS", "").split(","),
+            token=os.getenv("CLUSTER_TOKEN"),
+        )
+
+    def register(self, name, handler):
+        # handler(params: dict) -> awaitable JSON-serialisable result
+        self._handlers[name] = handler
+
+    def unregister(self, name):
+        self._handlers.pop(name, None)
+
+    def attach(self, app):
+        app.router.add_post("/cluster/{name}", self._handle)
+
+    async def _handle(self, request):
+        if not self.token or not hmac.compare_digest(request.headers.get("X-Cluster-Token", ""), self.token):
+            return web.json_response({"error": "unauthorized"}, status=401)
+        handler = self._handlers.get(request.match_info["name"])
+        if handler is None:
+            return web.json_response({"error": "unknown query"}, status=404)
+        params = await request.json() if request.can_read_body else {}
+        return web.json_response({"cluster_id": self.cluster_id, "result": await handler(params)})
+
+    async def gather(self, name, params=None, *, timeout=5.0):
+        if not self.peers or not self.token:
+            return []
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession()
+        # per request: the session is shared by callers with different deadlines
+        request_timeout = aiohttp.ClientTimeout(total=timeout)
+
+        async def ask(peer):
+            try:
+                async with self._session.post(f"{peer}/cluster/{name}", json=params or {}, timeout=request_timeout,
+                                              headers={"X-Cluster-Token": self.token}) as resp:
+                    if resp.status != 200:
+                        return None
+                    return await resp.json()
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                return None
+
+        answers = await asyncio.gather(*(ask(p) for p in self.peers))
+        return [a for a in answers if a is not None]
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
@@ -0,0 +1,10 @@
+# utils/config.py
+import os
+
+# where local state (sqlite stores, indexes) lives; override on hosts with a persistent disk
+DATA_DIR = os.getenv("DATA_DIR", "data")
+
+
+def data_path(filename):
+    os.makedirs(DATA_DIR, exist_ok=True)
+    return os.path.join(DATA_DIR, filename)
@@ -0,0 +1,124 @@
+# utils/gazetteer.py (offline place-name index for the time command)
+import bisect
+import os
+import threading
+import unicodedata
+from array import array
+
+DEFAULT_INDEX = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "gazetteer.tsv")
+
+
+def normalize_key(text):
+    # casefold, strip accents and punctuation: "São Paulo" -> "sao paulo"
+    text = unicodedata.normalize("NFKD", text.casefold())
+    text = "".join(ch for ch in text if not unicodedata.combining(ch))
+    text = "".join(ch if ch.isalnum() else " " for ch in text)
+    return " ".join(text.split())
+
+
+def within_one_typo(a, b):
+    """True if `b` is `a` with one substituted, swapped, missing or extra
+    letter. A missing/extra letter at the very end doesn't count: that is
+    usually a different word (india/indian, niger/nigeria), not a typo."""
+    if a == b:
+        return True
+    la, lb = len(a), len(b)
+    if abs(la - lb) > 1:
+        return False
+    i = 0
+    while i < min(la, lb) and a[i] == b[i]:
+        i += 1
+    if la == lb:
+        return a[i + 1:] == b[i + 1:] or (a[i + 2:] == b[i + 2:] and a[i] == b[i + 1] and a[i + 1] == b[i])
+    if i == min(la, lb):
+        return False  # one is the other plus a trailing letter
+    return a[i:] == b[i + 1:] if la < lb else a[i + 1:] == b[i:]
+
+
+class Gazetteer:
+    """Sorted, array-backed index of place names/aliases -> (lat, lng, zone).
+
+    The index file is produced by scripts/build_gazetteer.py. It is read
+    lazily on the first lookup; afterwards every lookup is an in-memory
+    binary search.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX, *, fuzzy_min_length=5):
+        self.path = path
+        self.fuzzy_min_length = fuzzy_min_length
+        self.keys = []
+        self.names = []
+        self.lat = array("d")
+        self.lng = array("d")
+        self.rank = array("I")
+        self.zone_idx = array("H")
+        self.zones = []
+        self.loaded = False
+        self._lock = threading.Lock()
+
+    def load(self):
+        with self._lock:
+            if self.loaded:
+                return
+            if os.path.exists(self.path):
+                with open(self.path, encoding="utf-8") as f:
+                    header = f.readline().rstrip("\n").split("\t")
+                    self.zones = header[1:]
+                    for line in f:
+                        key, name, lat, lng, rank, zone = line.rstrip("\n").split("\t")
+                        self.keys.append(key)
+                        self.names.append(name)
+                        self.lat.append(float(lat))
+                        self.lng.append(float(lng))
+                        self.rank.append(int(rank))
+                        self.zone_idx.append(int(zone))
+            else:
+                print(f"⚠️ Gazetteer index not found at {self.path}; run scripts/build_gazetteer.py")
+            self.loaded = True
+
+    def __len__(self):
+        return len(self.keys)
+
+    def _entry(self, i):
+        return self.names[i], self.lat[i], self.lng[i], self.zones[self.zone_idx[i]]
+
+    def _prefix_range(self, prefix):
+        lo = bisect.bisect_left(self.keys, prefix)
+        hi = bisect.bisect_left(self.keys, prefix + "\uffff", lo)
+        return lo, hi
+
+    def lookup(self, query, *, fuzzy=True):
+        """Return (name, lat, lng, zone) for the best match, or None.
+
+        Beyond exact names, an abbreviated multi-word name ("san fran") matches
+        by prefix and, with fuzzy=True, a single typo is forgiven ("londn").
+        Anything looser returns None so the geocoder gets to answer: a near
+        miss here is usually a different real place (portland/poland).
+        """
+        if not self.loaded:
+            self.load()
+        key = normalize_key(query)
+        if not key or not self.keys:
+            return None
+
+        # exact name/alias
+        i = bisect.bisect_left(self.keys, key)
+        if i < len(self.keys) and self.keys[i] == key:
+            return self._entry(i)
+
+        # prefix of a multi-word name ("san fran" -> "san francisco"), most
+        # prominent place wins; single words don't ("niger" is not "nigeria")
+        if " " in key and len(key) >= 4:
+            lo, hi = self._prefix_range(key)
+            if lo < hi:
+                best = min(range(lo, hi), key=self.rank.__getitem__)
+                return self._entry(best)
+
+        # one typo, only against keys sharing the first letter to stay cheap
+        if not fuzzy or len(key) < self.fuzzy_min_length:
+            return None
+        lo, hi = self._prefix_range(key[0])
+        matches = [i for i in range(lo, hi) if abs(len(self.keys[i]) - len(key)) <= 1 and within_one_typo(key, self.keys[i])]
+        if matches:
+            return self._entry(min(matches, key=self.rank.__getitem__))
+        return None
@@ -0,0 +1,99 @@
+# utils/geo.py (shared geocoding + timezone lookups for the time command)
+import asyncio
+
+from utils.cache import MISSING, TTLCache
+
+
+def normalize_location(text):
+    # "  new   YORK " -> "new york" so equivalent queries share a cache slot
+    return " ".join(text.casefold().split())
+
+
+class LocationResolver:
+    """Resolves a place name to (display name, lat, lng, IANA zone).
+
+    Places in the offline gazetteer are answered locally; only misses go out
+    to Nominatim, and a typo-tolerant gazetteer match is tried only when
+    Nominatim finds nothing. The Nominatim client and TimezoneFinder are
+    built once, lookups run in a worker thread so they never block the event
+    loop, and identical queries that arrive while one is in flight share a
+    single lookup.
+    """
+
+    def __init__(self, *, user_agent="time-bot", gazetteer=None, maxsize=2048, ttl=24 * 3600.0):
+        self.user_agent = user_agent
+        self.gazetteer = gazetteer
+        self.gazetteer_hits = 0
+        self.geocode_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.tz_cache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._geolocator = None
+        self._tf = None
+        self._inflight = {}
+
+    def _geocode_sync(self, query):
+        if self._geolocator is None:
+            from geopy.geocoders import Nominatim
+            self._geolocator = Nominatim(user_agent=self.user_agent)
+        loc = self._geolocator.geocode(query)
+        if not loc:
+            return None
+        return (loc.address, loc.latitude, loc.longitude)
+
+    def _timezone_sync(self, lat, lng):
+        if self._tf is None:
+            from timezonefinder import TimezoneFinder
+            self._tf = TimezoneFinder()
+        return self._tf.timezone_at(lat=lat, lng=lng)
+
+    async def _coalesced(self, key, func, *args):
+        # concurrent callers for the same key await the same future
+        fut = self._inflight.get(key)
+        if fut is not None:
+            return await asyncio.shield(fut)
+        fut = asyncio.ensure_future(asyncio.to_thread(func, *args))
+        self._inflight[key] = fut
+        fut.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(fut)
+
+    async def geocode(self, location):
+        key = normalize_location(location)
+        cached = self.geocode_cache.get(key, MISSING)
+        if cached is not MISSING:
+            return cached
+        result = await self._coalesced(("geo", key), self._geocode_sync, key)
+        # negative results are cached too so typos don't hammer Nominatim
+        self.geocode_cache.set(key, result)
+        return result
+
+    async def timezone_at(self, lat, lng):
+        # ~1km grid is plenty for picking a zone
+        key = (round(lat, 2), round(lng, 2))
+        cached = self.tz_cache.get(key, MISSING)
+        if cached is not MISSING:
+            return cached
+        result = await self._coalesced(("tz", key), self._timezone_sync, lat, lng)
+        self.tz_cache.set(key, result)
+        return result
+
+    async def resolve(self, location):
+        if self.gazetteer is not None:
+            if not self.gazetteer.loaded:
+                await asyncio.to_thread(self.gazetteer.load)
+            hit = self.gazetteer.lookup(location, fuzzy=False)
+            if hit is not None:
+                self.gazetteer_hits += 1
+                return hit
+        geo = await self.geocode(location)
+        if geo is None:
+            hit = self.gazetteer.lookup(location) if self.gazetteer is not None else None
+            if hit is not None:
+                self.gazetteer_hits += 1
+            return hit
+        address, lat, lng = geo
+        return address, lat, lng, await self.timezone_at(lat, lng)
+
+    def stats(self):
+        stats = {"geocode": self.geocode_cache.stats(), "timezone": self.tz_cache.stats()}
+        if self.gazetteer is not None:
+            stats["gazetteer"] = {"size": len(self.gazetteer), "hits": self.gazetteer_hits}
+        return stats
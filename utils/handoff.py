@@ -0,0 +1,69 @@
+# utils/handoff.py (live state carried across extension reloads)
+import asyncio
+import contextlib
+
+
+class HandOff:
+    """Holds cog state between the old cog's unload and the new one's init.
+
+    While a reload is running (`reloading(bot)`), cogs `stash` their live
+    objects in cog_unload instead of closing them, and the reloaded cog
+    `claim`s them in __init__. A claim only peeks: the state is handed over
+    when the reload ends, and only if the claiming cog is still loaded. If
+    the new code fails to load, discord.py rolls back to the old module,
+    whose cog claims the same state again; if nothing loaded claimed it (the
+    new code no longer wants it, the rollback failed too, or the extension
+    was unloaded for good) it is closed with the `close` callback it was
+    stashed with.
+    """
+
+    def __init__(self):
+        self._stash = {}   # key -> (value, close)
+        self._owners = {}  # key -> cog that claimed it last
+        self._depth = 0
+        self._bot = None
+
+    @property
+    def active(self):
+        return self._depth > 0
+
+    @contextlib.asynccontextmanager
+    async def reloading(self, bot):
+        self._depth += 1
+        self._bot = bot
+        try:
+            yield self
+        finally:
+            self._depth -= 1
+            if not self._depth:
+                await self.discard_all()
+                self._bot = None
+
+    def stash(self, key, value, *, close=None):
+        self._stash[key] = (value, close)
+        self._owners.pop(key, None)
+
+    def claim(self, key, default=None, *, owner=None):
+        if key not in self._stash:
+            return default
+        self._owners[key] = owner
+        return self._stash[key][0]
+
+    async def discard_all(self):
+        live = set(map(id, self._bot.cogs.values())) if self._bot is not None else set()
+        stashed, self._stash = self._stash, {}
+        owners, self._owners = self._owners, {}
+        for key, (_, close) in stashed.items():
+            if key in owners and id(owners[key]) in live:
+                continue  # handed over to a cog that loaded
+            if close is None:
+                continue
+            try:
+                result = close()
+                if asyncio.iscoroutine(result):
+                    await result
+            except Exception as e:
+                print(f"⚠️ Failed to close unclaimed state {key!r}:", repr(e))
+
+
+HANDOFF = HandOff()
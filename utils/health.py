@@ -0,0 +1,106 @@
+# utils/health.py (in-loop HTTP keep-alive, health and Prometheus metrics)
+import json
+import math
+import time
+
+from aiohttp import web
+
+from utils.metrics import REGISTRY, Gauge, stats_snapshot
+from utils.watchdog import LoopWatchdog
+
+
+def _finite(value):
+    return value if isinstance(value, (int, float)) and math.isfinite(value) else None
+
+
+class HealthServer:
+    """aiohttp server on the bot's own loop.
+
+    /        plain "Bot is alive!" for uptime pingers
+    /health  JSON gateway + loop health; 503 when disconnected or lagging
+    /metrics Prometheus text format
+    /stats   JSON per-command stats
+    """
+
+    def __init__(self, bot, host="0.0.0.0", port=8080, *, max_loop_lag=1.0, stall_threshold=0.25):
+        self.bot = bot
+        self.host = host
+        self.port = port
+        self.max_loop_lag = max_loop_lag
+        self.started_at = time.time()
+        # also samples the stack of whatever blocks the loop (see -stalls)
+        self.lag_monitor = LoopWatchdog(bot, threshold=stall_threshold)
+        self.app = web.Application()
+        self.app.router.add_get("/", self.handle_root)
+        self.app.router.add_get("/health", self.handle_health)
+        self.app.router.add_get("/metrics", self.handle_metrics)
+        self.app.router.add_get("/stats", self.handle_stats)
+        self._runner = None
+
+        REGISTRY.register(Gauge("discord_gateway_latency_seconds", "Gateway heartbeat latency.",
+                                lambda: _finite(self.bot.latency)))
+        REGISTRY.register(Gauge("discord_gateway_connected", "1 if the gateway is connected and ready.",
+                                lambda: int(self.connected())))
+        REGISTRY.register(Gauge("discord_event_loop_lag_seconds", "Latest event-loop scheduling lag.",
+                                lambda: self.lag_monitor.lag))
+        REGISTRY.register(Gauge("discord_guilds", "Guilds the bot is in.",
+                                lambda: len(self.bot.guilds)))
+
+    def connected(self):
+        shards = getattr(self.bot, "shards", None)
+        if shards:
+            # AutoShardedBot keeps no single `ws`; every local shard must be up
+            return self.bot.is_ready() and not self.bot.is_closed() and all(
+                not shard.is_closed() for shard in shards.values())
+        ws = getattr(self.bot, "ws", None)
+        return self.bot.is_ready() and not self.bot.is_closed() and ws is not None and ws.open
+
+    def snapshot(self):
+        connected = self.connected()
+        lag = self.lag_monitor.max_lag
+        if not connected:
+            status = "down"
+        elif lag > self.max_loop_lag:
+            status = "degraded"
+        else:
+            status = "ok"
+        latency = _finite(self.bot.latency)
+        return {
+            "status": status,
+            "connected": connected,
+            "gateway_latency_ms": round(latency * 1000, 1) if latency is not None else None,
+            "loop_lag_ms": round(self.lag_monitor.lag * 1000, 2),
+            "loop_lag_max_ms": round(lag * 1000, 2),
+            "guilds": len(self.bot.guilds),
+            "shards": sorted(getattr(self.bot, "shards", {}) or [0]),
+            "uptime_s": int(time.time() - self.started_at),
+        }
+
+    async def handle_root(self, request):
+        return web.Response(text="Bot is alive!")
+
+    async def handle_health(self, request):
+        snap = self.snapshot()
+        return web.Response(
+            text=json.dumps(snap), content_type="application/json",
+            status=200 if snap["status"] == "ok" else 503,
+        )
+
+    async def handle_metrics(self, request):
+        return web.Response(text=REGISTRY.render(), content_type="text/plain", charset="utf-8")
+
+    async def handle_stats(self, request):
+        return web.json_response(stats_snapshot())
+
+    async def start(self):
+        self.lag_monitor.start()
+        self._runner = web.AppRunner(self.app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        print(f"✅ Health server listening on {self.host}:{self.port}", flush=True)
+
+    async def close(self):
+        await self.lag_monitor.stop()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,95 @@
+# utils/hotreload.py (reload/load/unload extensions in place, optional file watcher)
+import asyncio
+import os
+import time
+
+from utils.handoff import HANDOFF
+from utils.loader import discover_cogs
+from utils.sync import sync_if_changed
+
+
+def extension_name(name, path="cogs"):
+    # "moderation" / "cogs/moderation.py" / "cogs.moderation" -> "cogs.moderation"
+    name = name.strip().replace("/", ".").replace(os.sep, ".")
+    if name.endswith(".py"):
+        name = name[:-3]
+    prefix = path.replace(os.sep, ".") + "."
+    return name if name.startswith(prefix) else prefix + name
+
+
+async def apply(bot, op, names):
+    """Run `op` ("reload", "load" or "unload") on each extension, handing
+    live cog state over between old and new code. Returns
+    [(name, error or None)] and re-syncs app commands if they changed."""
+    method = {"reload": bot.reload_extension, "load": bot.load_extension, "unload": bot.unload_extension}[op]
+    results = []
+    async with HANDOFF.reloading(bot):
+        for name in names:
+            started = time.perf_counter()
+            try:
+                await method(name)
+            except Exception as e:
+                # ExtensionError, or the raw error when discord.py's rollback to the old module failed too
+                print(f"❌ {op} {name} failed:", repr(e), flush=True)
+                results.append((name, e))
+                continue
+            print(f"♻️ {op} {name} ({(time.perf_counter() - started) * 1000:.0f} ms)", flush=True)
+            results.append((name, None))
+
+    if any(error is None for _, error in results) and os.getenv("SYNC_COMMANDS", "1") != "0":
+        try:
+            await sync_if_changed(bot, getattr(bot, "sync_guild", None))
+        except Exception as e:
+            print("❌ Sync after reload failed:", repr(e), flush=True)
+    return results
+
+
+class ExtensionWatcher:
+    """Polls the cogs folder and reloads extensions whose file changed
+    (new files are loaded, deleted ones unloaded). Enabled with HOT_RELOAD=1.
+    Changes to utils/ still need a restart."""
+
+    def __init__(self, bot, path="cogs", *, interval=1.0):
+        self.bot = bot
+        self.path = path
+        self.interval = interval
+        self._mtimes = {}
+        self._task = None
+
+    def _scan(self):
+        mtimes = {}
+        for name in discover_cogs(self.path):
+            try:
+                mtimes[name] = os.stat(os.path.join(self.path, name.rsplit(".", 1)[1] + ".py")).st_mtime_ns
+            except OSError:
+                pass
+        return mtimes
+
+    def start(self):
+        self._mtimes = self._scan()
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            current = await asyncio.to_thread(self._scan)
+            changed = [n for n, m in current.items() if n in self._mtimes and m != self._mtimes[n]]
+            added = [n for n in current if n not in self._mtimes]
+            removed = [n for n in self._mtimes if n not in current]
+            self._mtimes = current
+            loaded = self.bot.extensions
+            if changed:
+                await apply(self.bot, "reload", [n for n in changed if n in loaded])
+            if added:
+                await apply(self.bot, "load", added)
+            if removed:
+                await apply(self.bot, "unload", [n for n in removed if n in loaded])
@@ -0,0 +1,134 @@
+# utils/loader.py (cog loader with a per-cog startup report)
+import asyncio
+import importlib.machinery
+import os
+import sys
+import time
+import traceback
+
+
+def rss_bytes():
+    # current RSS; /proc on Linux, peak RSS elsewhere (best effort)
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+    except ImportError:
+        return None
+
+
+def discover_cogs(path="cogs"):
+    if not os.path.isdir(path):
+        return []
+    return [
+        f"{path.replace(os.sep, '.')}.{filename[:-3]}"
+        for filename in sorted(os.listdir(path))
+        if filename.endswith(".py") and filename != "__init__.py"
+    ]
+
+
+class CogTiming:
+    __slots__ = ("name", "import_s", "setup_s", "load_s", "mem_delta", "error")
+
+    def __init__(self, name):
+        self.name = name
+        self.import_s = 0.0  # module body, including everything it imports
+        self.setup_s = 0.0  # the rest of load_extension: setup(), add_cog, cog_load
+        self.load_s = 0.0
+        self.mem_delta = None
+        self.error = None
+
+
+class _TimedLoader:
+    # wraps a cog's loader so its module body is timed apart from setup
+    def __init__(self, loader, timing):
+        self._loader = loader
+        self._timing = timing
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        start = time.perf_counter()
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._timing.import_s = time.perf_counter() - start
+            # later reloads and tracebacks should see the real loader
+            module.__loader__ = module.__spec__.loader = self._loader
+
+
+class _CogImportTimer:
+    # meta path finder installed only while load_cogs runs; it matches the
+    # cog modules themselves and leaves every other import alone
+    def __init__(self, timings):
+        self.timings = timings
+
+    def find_spec(self, fullname, path, target=None):
+        timing = self.timings.get(fullname)
+        if timing is None:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path, target)
+        if spec is not None and spec.loader is not None:
+            spec.loader = _TimedLoader(spec.loader, timing)
+        return spec
+
+
+async def load_cogs(bot, path="cogs", *, timeout=12.0):
+    """Load every cog in `path`; returns a list of CogTiming.
+
+    Cogs load one by one, in order. Each records its import time (the
+    module body and whatever it imports), its setup time (the rest of
+    load_extension) and the RSS it added. Prewarming their imports in
+    worker threads was tried and measured slower: imports serialise on the
+    GIL and the import lock, so the threads only add overhead.
+    """
+    timings = {name: CogTiming(name) for name in discover_cogs(path)}
+    timer = _CogImportTimer(timings)
+    sys.meta_path.insert(0, timer)
+    try:
+        for name, timing in timings.items():
+            print(f">> attempting to load {name}", flush=True)
+            before = rss_bytes()
+            start = time.perf_counter()
+            try:
+                # use a timeout so a blocking import/setup can't hang the loader forever
+                await asyncio.wait_for(bot.load_extension(name), timeout=timeout)
+                print(f"✅ Loaded cog: {name}", flush=True)
+            except asyncio.TimeoutError:
+                timing.error = f"timeout (>{timeout:g}s)"
+                print(f"⏱️ Timeout while loading {name} (took >{timeout:g}s).", flush=True)
+            except Exception as e:
+                timing.error = repr(e)
+                print(f"❌ Failed to load {name}: {repr(e)}", flush=True)
+                print("---- FULL TRACEBACK ----", flush=True)
+                print(traceback.format_exc(), flush=True)
+                print("---- end traceback ----", flush=True)
+            timing.load_s = time.perf_counter() - start
+            timing.setup_s = max(0.0, timing.load_s - timing.import_s)
+            after = rss_bytes()
+            if before is not None and after is not None:
+                timing.mem_delta = after - before
+    finally:
+        sys.meta_path.remove(timer)
+
+    return list(timings.values())
+
+
+def format_report(timings, wall_s=None):
+    lines = [f"{'cog':<22}{'import':>10}{'setup':>10}{'mem Δ':>10}  status"]
+    for t in timings:
+        mem = f"{t.mem_delta / 1048576:+.1f}MB" if t.mem_delta is not None else "n/a"
+        status = "ok" if t.error is None else t.error
+        lines.append(f"{t.name:<22}{t.import_s * 1000:>8.1f}ms{t.setup_s * 1000:>8.1f}ms{mem:>10}  {status}")
+    if wall_s is not None:
+        lines.append(f"total wall time: {wall_s * 1000:.1f}ms")
+    return "\n".join(lines)
@@ -0,0 +1,159 @@
+# utils/members.py (member cache profiles: full / lazy / lru)
+import asyncio
+from collections import OrderedDict
+
+import discord
+
+PROFILES = ("full", "lazy", "lru")
+
+
+def member_cache_options(profile):
+    """Bot constructor kwargs for a MEMBER_CACHE profile.
+
+    full  every member of every guild, chunked at startup (discord.py default)
+    lazy  nothing chunked at startup; a guild is chunked the first time a
+          command is used in it
+    lru   no library member cache at all; recently seen members are kept in a
+          bounded MemberLRU and everything else is fetched over REST
+    """
+    if profile == "full":
+        return {}
+    if profile == "lazy":
+        return {"chunk_guilds_at_startup": False}
+    if profile == "lru":
+        return {"chunk_guilds_at_startup": False, "member_cache_flags": discord.MemberCacheFlags.none()}
+    raise ValueError(f"MEMBER_CACHE must be one of {', '.join(PROFILES)}, got {profile!r}")
+
+
+class MemberLRU:
+    """(guild_id, user_id) -> Member, bounded; the oldest entry is evicted first."""
+
+    def __init__(self, maxsize=5000):
+        self.maxsize = maxsize
+        self._members = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._members)
+
+    def get(self, guild_id, user_id):
+        key = (guild_id, user_id)
+        member = self._members.get(key)
+        if member is None:
+            self.misses += 1
+            return None
+        self._members.move_to_end(key)
+        self.hits += 1
+        return member
+
+    def put(self, member):
+        key = (member.guild.id, member.id)
+        self._members[key] = member
+        self._members.move_to_end(key)
+        if len(self._members) > self.maxsize:
+            self._members.popitem(last=False)
+
+    def discard(self, guild_id, user_id):
+        self._members.pop((guild_id, user_id), None)
+
+    def drop_guild(self, guild_id):
+        for key in [k for k in self._members if k[0] == guild_id]:
+            del self._members[key]
+
+
+class MemberCache:
+    """Member lookups that work the same under every profile.
+
+    `get` checks the library cache, then the LRU; `get_or_fetch` falls back to
+    REST. Under the lazy profile `ensure_chunked` chunks a guild in the
+    background the first time it's used and dispatches `guild_chunked` so
+    indexes built from guild.members can catch up.
+    """
+
+    def __init__(self, bot, profile="full", *, maxsize=5000):
+        self.bot = bot
+        self.profile = profile
+        self.lru = MemberLRU(maxsize) if profile == "lru" else None
+        self._chunking = {}
+
+    def get(self, guild, user_id):
+        member = guild.get_member(user_id)
+        if member is None and self.lru is not None:
+            member = self.lru.get(guild.id, user_id)
+        return member
+
+    def remember(self, member):
+        if self.lru is not None and isinstance(member, discord.Member):
+            self.lru.put(member)
+
+    def forget(self, guild_id, user_id):
+        if self.lru is not None:
+            self.lru.discard(guild_id, user_id)
+
+    async def get_or_fetch(self, guild, user_id):
+        member = self.get(guild, user_id)
+        if member is None:
+            member = await guild.fetch_member(user_id)
+            self.remember(member)
+        return member
+
+    def ensure_chunked(self, guild):
+        if self.profile != "lazy" or guild is None or guild.chunked or guild.id in self._chunking:
+            return
+        self._chunking[guild.id] = asyncio.create_task(self._chunk(guild))
+
+    async def _chunk(self, guild):
+        try:
+            await guild.chunk(cache=True)
+            print(f"👥 Chunked {guild.name} ({guild.member_count} members)")
+            self.bot.dispatch("guild_chunked", guild)
+        except Exception as e:
+            print(f"⚠️ Failed to chunk {guild.id}:", repr(e))
+        finally:
+            self._chunking.pop(guild.id, None)
+
+    def stats(self):
+        out = {
+            "profile": self.profile,
+            "cached_members": sum(len(g.members) for g in self.bot.guilds),
+            "chunked_guilds": sum(1 for g in self.bot.guilds if g.chunked),
+        }
+        if self.lru is not None:
+            total = self.lru.hits + self.lru.misses
+            out["lru"] = {"size": len(self.lru), "maxsize": self.lru.maxsize, "hits": self.lru.hits,
+                          "misses": self.lru.misses, "hit_rate": round(self.lru.hits / total, 3) if total else None}
+        return out
+
+
+def install_member_cache(bot, profile="full", *, maxsize=5000):
+    """Attach `bot.member_cache` and the listeners the lazy/lru profiles need."""
+    cache = MemberCache(bot, profile, maxsize=maxsize)
+    bot.member_cache = cache
+
+    async def on_command(ctx):
+        cache.ensure_chunked(ctx.guild)
+
+    async def on_interaction(interaction):
+        cache.ensure_chunked(interaction.guild)
+        cache.remember(interaction.user)
+
+    async def on_message(message):
+        cache.remember(message.author)
+
+    async def on_member_remove(payload):
+        cache.forget(payload.guild_id, payload.user.id)
+
+    async def on_guild_remove(guild):
+        if cache.lru is not None:
+            cache.lru.drop_guild(guild.id)
+
+    if profile == "lazy":
+        bot.add_listener(on_command)
+        bot.add_listener(on_interaction)
+    elif profile == "lru":
+        bot.add_listener(on_interaction)
+        bot.add_listener(on_message)
+        bot.add_listener(on_member_remove, "on_raw_member_remove")
+        bot.add_listener(on_guild_remove)
+    return cache
@@ -0,0 +1,288 @@
+# utils/metrics.py (tiny Prometheus-format metrics registry, no extra dependency)
+import contextvars
+import logging
+import math
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _num(value):
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return "NaN"
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name, doc, labelnames=()):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def render(self):
+        yield f"# HELP {self.name} {self.doc}"
+        yield f"# TYPE {self.name} counter"
+        for labels, value in sorted(self.values.items()):
+            yield f"{self.name}{_labels(self.labelnames, labels)} {_num(value)}"
+
+
+class Gauge:
+    # value is read from `func()` at scrape time
+    def __init__(self, name, doc, func):
+        self.name = name
+        self.doc = doc
+        self.func = func
+
+    def render(self):
+        yield f"# HELP {self.name} {self.doc}"
+        yield f"# TYPE {self.name} gauge"
+        try:
+            value = self.func()
+        except Exception:
+            value = None
+        yield f"{self.name} {_num(value)}"
+
+
+class Histogram:
+    def __init__(self, name, doc, labelnames=(), buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.doc = doc
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        self.series = {}  # labels -> [bucket counts..., sum, count]
+
+    def observe(self, value, *labels):
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series[labels] = [0] * len(self.buckets) + [0.0, 0]
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[i] += 1
+                break
+        series[-2] += value
+        series[-1] += 1
+
+    def quantile_bound(self, series, q):
+        # upper bucket bound (ms) containing the q-quantile; None if empty or above the last bucket
+        if not series or not series[-1]:
+            return None
+        target = q * series[-1]
+        cumulative = 0
+        for bound, count in zip(self.buckets, series):
+            cumulative += count
+            if cumulative >= target:
+                return bound * 1000
+        return None
+
+    def render(self):
+        yield f"# HELP {self.name} {self.doc}"
+        yield f"# TYPE {self.name} histogram"
+        for labels, series in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                yield f"{self.name}_bucket{_labels(self.labelnames + ('le',), labels + (bound,))} {cumulative}"
+            yield f"{self.name}_bucket{_labels(self.labelnames + ('le',), labels + ('+Inf',))} {series[-1]}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {_num(series[-2])}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {series[-1]}"
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def register(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def render(self):
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+COMMANDS_TOTAL = REGISTRY.register(Counter(
+    "discord_commands_total", "Commands invoked, by command and outcome.", ("command", "status")))
+COMMAND_LATENCY = REGISTRY.register(Histogram(
+    "discord_command_latency_seconds", "Command wall-clock latency.", ("command",)))
+RATELIMIT_HITS = REGISTRY.register(Counter(
+    "discord_ratelimit_hits_total", "HTTP 429 responses from Discord, by scope.", ("scope",)))
+
+
+COMMAND_OWN_SECONDS = REGISTRY.register(Histogram(
+    "discord_command_own_seconds", "Command time spent in our code (total minus REST waits).", ("command",)))
+COMMAND_REST_SECONDS = REGISTRY.register(Histogram(
+    "discord_command_rest_seconds", "Command time spent awaiting Discord REST calls.", ("command",)))
+REST_LATENCY = REGISTRY.register(Histogram(
+    "discord_rest_latency_seconds", "Discord REST request latency, by route.", ("route",)))
+
+
+# ---- command timing (prefix + hybrid commands) ----
+class CommandTiming:
+    __slots__ = ("name", "started", "rest_s", "rest_calls", "done")
+
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.rest_s = 0.0
+        self.rest_calls = 0
+        self.done = False
+
+
+class CommandStats:
+    # running totals per command for -stats / the JSON dump
+    __slots__ = ("count", "errors", "total_s", "rest_s", "rest_calls", "max_s")
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_s = 0.0
+        self.rest_s = 0.0
+        self.rest_calls = 0
+        self.max_s = 0.0
+
+
+# the timing of the command running in the current task, read by the REST wrapper
+current_command = contextvars.ContextVar("current_command", default=None)
+COMMAND_STATS = {}
+
+
+def _finish(timing, failed):
+    timing.done = True
+    total = time.perf_counter() - timing.started
+    own = max(0.0, total - timing.rest_s)
+    COMMAND_LATENCY.observe(total, timing.name)
+    COMMAND_OWN_SECONDS.observe(own, timing.name)
+    COMMAND_REST_SECONDS.observe(timing.rest_s, timing.name)
+    COMMANDS_TOTAL.inc(timing.name, "error" if failed else "ok")
+
+    stats = COMMAND_STATS.get(timing.name)
+    if stats is None:
+        stats = COMMAND_STATS[timing.name] = CommandStats()
+    stats.count += 1
+    stats.errors += failed
+    stats.total_s += total
+    stats.rest_s += timing.rest_s
+    stats.rest_calls += timing.rest_calls
+    if total > stats.max_s:
+        stats.max_s = total
+
+
+async def _before_invoke(ctx):
+    timing = CommandTiming(ctx.command.qualified_name)
+    ctx.metrics_timing = timing
+    current_command.set(timing)
+
+
+async def _after_invoke(ctx):
+    timing = getattr(ctx, "metrics_timing", None)
+    if timing is not None and not timing.done:
+        _finish(timing, ctx.command_failed)
+
+
+async def _on_command_error(ctx, error):
+    # hybrid commands invoked as slash commands skip after-hooks on failure,
+    # and check failures (e.g. missing permissions) never reach before-invoke
+    if ctx.command is None:
+        return
+    timing = getattr(ctx, "metrics_timing", None)
+    if timing is None:
+        timing = ctx.metrics_timing = CommandTiming(ctx.command.qualified_name)
+    if not timing.done:
+        _finish(timing, True)
+
+
+def install_command_metrics(bot):
+    bot.before_invoke(_before_invoke)
+    bot.after_invoke(_after_invoke)
+    bot.add_listener(_on_command_error, "on_command_error")
+    install_rest_timing(bot)
+
+
+def install_rest_timing(bot):
+    # wrap HTTPClient.request on the instance so every REST call is timed
+    http = bot.http
+    if getattr(http.request, "metrics_wrapped", False):
+        return
+    original = http.request
+
+    async def request(route, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await original(route, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            REST_LATENCY.observe(elapsed, f"{route.method} {route.path}")
+            timing = current_command.get()
+            if timing is not None and not timing.done:
+                timing.rest_s += elapsed
+                timing.rest_calls += 1
+
+    request.metrics_wrapped = True
+    http.request = request
+
+
+def stats_snapshot():
+    """Machine-readable per-command stats (used by -stats json and /stats)."""
+    out = {}
+    for name, s in sorted(COMMAND_STATS.items()):
+        series = COMMAND_LATENCY.series.get((name,))
+        out[name] = {
+            "count": s.count,
+            "errors": s.errors,
+            "error_rate": round(s.errors / s.count, 4) if s.count else 0.0,
+            "avg_ms": round(s.total_s / s.count * 1000, 2) if s.count else 0.0,
+            "avg_own_ms": round((s.total_s - s.rest_s) / s.count * 1000, 2) if s.count else 0.0,
+            "avg_rest_ms": round(s.rest_s / s.count * 1000, 2) if s.count else 0.0,
+            "rest_calls": s.rest_calls,
+            "max_ms": round(s.max_s * 1000, 2),
+            "p50_ms_le": COMMAND_LATENCY.quantile_bound(series, 0.50),
+            "p99_ms_le": COMMAND_LATENCY.quantile_bound(series, 0.99),
+        }
+    return out
+
+
+# ---- rate limits: discord.py logs every 429 it handles on discord.http ----
+class RateLimitLogHandler(logging.Handler):
+    def emit(self, record):
+        msg = record.msg if isinstance(record.msg, str) else ""
+        if msg.startswith("We are being rate limited"):
+            RATELIMIT_HITS.inc("route")
+        elif msg.startswith("Global rate limit has been hit"):
+            # logged right after the route warning for the same 429, with no
+            # await in between, so move that hit over instead of adding one
+            RATELIMIT_HITS.inc("route", amount=-1)
+            RATELIMIT_HITS.inc("global")
+
+
+def install_ratelimit_metrics():
+    logger = logging.getLogger("discord.http")
+    if any(isinstance(h, RateLimitLogHandler) for h in logger.handlers):
+        return
+    if not logging.getLogger().handlers:
+        # any handler on discord.http switches off logging's last-resort
+        # stderr output, so keep the 429 warnings visible with our own
+        stderr = logging.StreamHandler()
+        stderr.setLevel(logging.WARNING)
+        stderr.setFormatter(logging.Formatter("%(levelname)s %(name)s: %(message)s"))
+        logger.addHandler(stderr)
+    logger.addHandler(RateLimitLogHandler(level=logging.WARNING))
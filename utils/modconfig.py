@@ -0,0 +1,51 @@
+# utils/modconfig.py (per-guild moderation settings, cached in memory, saved as JSON)
+import asyncio
+import json
+import os
+
+DEFAULTS = {
+    "muted_role_id": None,
+    "mute_mode": "role",  # "role" (Muted role) or "timeout" (Discord's native timeout)
+    "automod": False,     # message flood / duplicate / mention spam filter
+    "raid_action": "off", # what to do with members joining during a join raid: off, mute, kick, ban
+    "modlog_channel_id": None,
+}
+
+
+class ModConfigStore:
+    """Guild id -> settings dict. Reads are plain dict lookups; writes
+    update the cache immediately and save the file off the event loop."""
+
+    def __init__(self, path):
+        self.path = path
+        self._data = {}
+        self._save_lock = asyncio.Lock()
+
+    def load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                raw = json.load(f)
+        except (OSError, ValueError):
+            raw = {}
+        self._data = {int(gid): cfg for gid, cfg in raw.items()}
+
+    def get(self, guild_id, key):
+        cfg = self._data.get(guild_id)
+        if cfg is not None and key in cfg:
+            return cfg[key]
+        return DEFAULTS.get(key)
+
+    async def set(self, guild_id, **values):
+        self._data.setdefault(guild_id, {}).update(values)
+        await self.save()
+
+    def _write(self, snapshot):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(snapshot, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.path)
+
+    async def save(self):
+        snapshot = {str(gid): dict(cfg) for gid, cfg in self._data.items()}
+        async with self._save_lock:
+            await asyncio.to_thread(self._write, snapshot)
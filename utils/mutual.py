@@ -0,0 +1,104 @@
+# utils/mutual.py (user id -> guild ids reverse index for the mutual command)
+import asyncio
+import time
+
+import discord
+
+from utils.cache import TTLCache
+
+
+class MutualGuildIndex:
+    """Reverse index of which guilds a user is in.
+
+    Fully-cached guilds are indexed from the member cache and kept current by
+    member join/leave events, so lookups against them are O(1). Guilds whose
+    members aren't cached are checked with `fetch_member`, fanned out under a
+    concurrency limit; discord.py queues each request on its per-guild route
+    bucket, so the limit only caps how many buckets we hit at once.
+    """
+
+    def __init__(self, *, concurrency=8, negative_ttl=600.0):
+        self.concurrency = concurrency
+        self._by_user = {}
+        self._indexed = set()
+        # (guild_id, user_id) pairs that fetch_member recently said don't exist
+        self._absent = TTLCache(maxsize=100_000, ttl=negative_ttl)
+
+    def add(self, guild_id, user_id):
+        self._by_user.setdefault(user_id, set()).add(guild_id)
+
+    def remove(self, guild_id, user_id):
+        guilds = self._by_user.get(user_id)
+        if guilds:
+            guilds.discard(guild_id)
+            if not guilds:
+                del self._by_user[user_id]
+
+    def index_guild(self, guild):
+        for member in guild.members:
+            self.add(guild.id, member.id)
+        if guild.chunked:
+            self._indexed.add(guild.id)
+
+    def drop_guild(self, guild_id):
+        self._indexed.discard(guild_id)
+        for user_id in [uid for uid, guilds in self._by_user.items() if guild_id in guilds]:
+            self.remove(guild_id, user_id)
+
+    def rebuild(self, guilds):
+        self._by_user.clear()
+        self._indexed.clear()
+        for guild in guilds:
+            self.index_guild(guild)
+
+    def stats(self):
+        return {"users": len(self._by_user), "indexed_guilds": len(self._indexed)}
+
+    async def scan(self, guilds, user_id, *, progress_interval=1.5):
+        """Async generator yielding (mutual guilds so far, checked, total, done).
+
+        Answers from the index/cache first, then streams a snapshot at most
+        every `progress_interval` seconds while REST fetches are outstanding.
+        """
+        known = self._by_user.get(user_id, ())
+        found = []
+        pending = []
+        for guild in guilds:
+            if guild.id in known or guild.get_member(user_id) is not None:
+                found.append(guild)
+            elif guild.id not in self._indexed and self._absent.get((guild.id, user_id)) is None:
+                pending.append(guild)
+
+        total = len(guilds)
+        checked = total - len(pending)
+        if not pending:
+            yield found, checked, total, True
+            return
+
+        yield found, checked, total, False
+        sem = asyncio.Semaphore(self.concurrency)
+
+        async def probe(guild):
+            async with sem:
+                try:
+                    await guild.fetch_member(user_id)
+                except discord.NotFound:
+                    self._absent.set((guild.id, user_id), True)
+                    return None
+                except discord.HTTPException:
+                    # 403/429/5xx say nothing about membership: don't cache, retry next scan
+                    return None
+            self.add(guild.id, user_id)
+            return guild
+
+        last = time.monotonic()
+        for fut in asyncio.as_completed([probe(g) for g in pending]):
+            guild = await fut
+            checked += 1
+            if guild is not None:
+                found.append(guild)
+            now = time.monotonic()
+            if now - last >= progress_interval and checked < total:
+                last = now
+                yield found, checked, total, False
+        yield found, checked, total, True
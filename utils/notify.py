@@ -0,0 +1,65 @@
+# utils/notify.py (target DMs for moderation actions: concurrent, deadline-bound, closed-DM cache)
+import asyncio
+
+import discord
+
+from utils.cache import TTLCache
+
+DM_CLOSED = "⚠️ Couldn't DM them (DMs closed)."
+DM_FAILED = "⚠️ Couldn't DM them."
+
+
+class DMDispatcher:
+    """Sends moderation DMs without holding up the moderator.
+
+    `send` starts the DM right away and returns a task resolving to True,
+    "closed" or "failed", so callers can run the action alongside it (or
+    await it first when the action would make the DM impossible, like a
+    kick). Each send is cut off after `timeout` seconds. Users whose DMs
+    are closed are remembered for `closed_ttl` seconds and skipped without
+    a request.
+    """
+
+    def __init__(self, *, timeout=3.0, closed_ttl=3600.0, maxsize=50_000):
+        self.timeout = timeout
+        self._closed = TTLCache(maxsize=maxsize, ttl=closed_ttl)
+        self._tasks = set()
+
+    def send(self, user, content):
+        task = asyncio.create_task(self._send(user, content))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    async def _send(self, user, content):
+        if self._closed.get(user.id):
+            return "closed"
+        try:
+            await asyncio.wait_for(user.send(content), timeout=self.timeout)
+            return True
+        except discord.Forbidden:
+            self._closed.set(user.id, True)
+            return "closed"
+        except (discord.HTTPException, asyncio.TimeoutError):
+            return "failed"
+
+    async def send_many(self, users, content, *, concurrency=10):
+        """DM every user; returns how many were delivered."""
+        sem = asyncio.Semaphore(concurrency)
+
+        async def one(user):
+            async with sem:
+                return await self._send(user, content)
+
+        results = await asyncio.gather(*(one(u) for u in users))
+        return sum(1 for r in results if r is True)
+
+    @staticmethod
+    def note(outcome):
+        """Suffix for the confirmation reply: empty when the DM went through."""
+        if outcome is True:
+            return ""
+        return "\n" + (DM_CLOSED if outcome == "closed" else DM_FAILED)
+
+    def stats(self):
+        return {"closed_dms": self._closed.stats(), "in_flight": len(self._tasks)}
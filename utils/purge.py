@@ -0,0 +1,249 @@
+# utils/purge.py (streaming purge: filter, bulk-delete in 100s, old messages one by one)
+import asyncio
+import json
+import re
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+
+try:
+    from re import _parser as sre_parse  # 3.11+
+except ImportError:
+    import sre_parse
+
+BULK_MAX = 100
+# Discord rejects bulk deletes of messages older than 14 days; keep a margin
+BULK_MAX_AGE = timedelta(days=14) - timedelta(minutes=5)
+
+MAX_PATTERN_LENGTH = 200
+_REPEATS = {"MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT"}
+
+
+def _check_pattern(parsed, in_repeat=False):
+    for op, av in parsed:
+        op = str(op)
+        if op in _REPEATS:
+            lo, hi, sub = av
+            repeats = hi > 1
+            if repeats and in_repeat:
+                raise re.error("nested quantifiers like (a+)+ are not allowed")
+            _check_pattern(sub, in_repeat or repeats)
+        elif op == "BRANCH":
+            if in_repeat:
+                raise re.error("alternation inside a repeated group like (a|b)* is not allowed")
+            for branch in av[1]:
+                _check_pattern(branch, in_repeat)
+        elif op == "SUBPATTERN":
+            _check_pattern(av[-1], in_repeat)
+        elif op in ("ASSERT", "ASSERT_NOT"):
+            _check_pattern(av[1], in_repeat)
+        elif op == "ATOMIC_GROUP":
+            _check_pattern(av, in_repeat)
+        elif op.startswith("GROUPREF"):
+            raise re.error("backreferences are not allowed")
+
+
+def validate_pattern(text):
+    """Reject `contains:` patterns that can't compile or that backtrack
+    exponentially ((a+)+, (a|aa)*, backreferences). Raises re.error."""
+    if len(text) > MAX_PATTERN_LENGTH:
+        raise re.error(f"pattern is longer than {MAX_PATTERN_LENGTH} characters")
+    _check_pattern(sre_parse.parse(text))
+    re.compile(text, re.IGNORECASE)
+
+
+class PatternTimeout(Exception):
+    pass
+
+
+# runs in the child: one JSON list of texts per line in, one list of bools out
+_WORKER = r"""
+import json, re, sys
+pattern = re.compile(sys.argv[1], re.IGNORECASE)
+for line in sys.stdin:
+    sys.stdout.write(json.dumps([pattern.search(t) is not None for t in json.loads(line)]) + "\n")
+    sys.stdout.flush()
+"""
+
+
+class RegexWorker:
+    """Searches texts with a user-supplied regex in a child process.
+
+    re can't be interrupted and holds the GIL while it backtracks, so a
+    thread can't bound it: even `\\w+x` takes ~250ms on one 4000-char
+    message. The child gets a page of texts at a time, and if a page takes
+    longer than `timeout` the process is killed and PatternTimeout raised.
+    """
+
+    def __init__(self, pattern, *, timeout=2.0):
+        self.pattern = pattern
+        self.timeout = timeout
+        self._proc = None
+
+    async def search_many(self, texts):
+        if self._proc is None:
+            self._proc = await asyncio.create_subprocess_exec(
+                sys.executable, "-I", "-c", _WORKER, self.pattern,
+                stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+            )
+        try:
+            self._proc.stdin.write((json.dumps(texts) + "\n").encode())
+            await self._proc.stdin.drain()
+            line = await asyncio.wait_for(self._proc.stdout.readline(), self.timeout)
+        except asyncio.TimeoutError:
+            await self.close()
+            raise PatternTimeout(f"pattern took over {self.timeout:g}s on {len(texts)} messages") from None
+        if not line:
+            await self.close()
+            raise PatternTimeout("pattern worker exited")
+        return json.loads(line)
+
+    async def close(self):
+        proc, self._proc = self._proc, None
+        if proc is not None and proc.returncode is None:
+            proc.kill()
+            await proc.wait()
+
+
+class PurgeFilter:
+    """Which messages a purge may delete. Pinned messages are included
+    unless pinned=False. The cheap checks run per message; the `contains`
+    regex runs a page at a time in a RegexWorker (see `select`)."""
+
+    __slots__ = ("author_ids", "pattern", "attachments", "bots", "pinned", "_worker")
+
+    def __init__(self, *, author_ids=None, pattern=None, attachments=False, bots=False, pinned=True, timeout=2.0):
+        if pattern:
+            validate_pattern(pattern)
+        self.author_ids = set(author_ids) if author_ids else None
+        self.pattern = pattern or None
+        self.attachments = attachments
+        self.bots = bots
+        self.pinned = pinned
+        self._worker = RegexWorker(pattern, timeout=timeout) if pattern else None
+
+    def __call__(self, message):
+        if not self.pinned and message.pinned:
+            return False
+        if self.author_ids is not None and message.author.id not in self.author_ids:
+            return False
+        if self.bots and not message.author.bot:
+            return False
+        if self.attachments and not message.attachments:
+            return False
+        return True
+
+    async def select(self, messages):
+        """The messages in `messages` (order kept) that match every filter."""
+        kept = [m for m in messages if self(m)]
+        if self._worker is None or not kept:
+            return kept
+        found = await self._worker.search_many([m.content for m in kept])
+        return [m for m, ok in zip(kept, found) if ok]
+
+    async def close(self):
+        if self._worker is not None:
+            await self._worker.close()
+
+
+class PurgeResult:
+    __slots__ = ("scanned", "deleted", "bulk_calls", "single_deletes", "started", "aborted")
+
+    def __init__(self):
+        self.scanned = 0
+        self.deleted = 0
+        self.bulk_calls = 0
+        self.single_deletes = 0
+        self.started = time.perf_counter()
+        self.aborted = None  # reason the scan stopped early, if it did
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    @property
+    def rate(self):
+        return self.deleted / self.elapsed if self.elapsed > 0 else 0.0
+
+
+async def purge_channel(channel, *, limit, check, before=None, after=None,
+                        scan_limit=20000, single_delay=1.0, progress=None):
+    """Delete up to `limit` messages selected by `check` (a PurgeFilter),
+    newest first.
+
+    History is streamed and filtered a page of 100 at a time; eligible
+    messages younger than 14 days are deleted in 100-message bulk calls,
+    older ones go through a separate single-delete lane throttled to one
+    call per `single_delay` seconds. `progress(result)` is awaited after
+    every delete call. If the filter's regex times out, the scan stops and
+    `result.aborted` says why; what was already deleted stays deleted.
+    """
+    result = PurgeResult()
+    cutoff = datetime.now(timezone.utc) - BULK_MAX_AGE
+    old_queue = asyncio.Queue()
+
+    async def single_lane():
+        while True:
+            message = await old_queue.get()
+            if message is None:
+                return
+            try:
+                await message.delete()
+                result.deleted += 1
+                result.single_deletes += 1
+            except Exception:
+                pass  # already gone / no access: skip it
+            if progress is not None:
+                await progress(result)
+            await asyncio.sleep(single_delay)
+
+    async def flush(batch):
+        await channel.delete_messages(batch)
+        result.deleted += len(batch)
+        result.bulk_calls += 1
+        if progress is not None:
+            await progress(result)
+
+    batch = []
+    queued = 0
+
+    async def take(page):
+        # returns True once `limit` messages are queued for deletion
+        nonlocal batch, queued
+        for message in await check.select(page):
+            if message.created_at < cutoff:
+                old_queue.put_nowait(message)
+            else:
+                batch.append(message)
+                if len(batch) == BULK_MAX:
+                    await flush(batch)
+                    batch = []
+            queued += 1
+            if queued >= limit:
+                return True
+        return False
+
+    lane = asyncio.create_task(single_lane())
+    page = []
+    try:
+        async for message in channel.history(limit=scan_limit, before=before, after=after, oldest_first=False):
+            result.scanned += 1
+            page.append(message)
+            if len(page) == BULK_MAX:
+                done = await take(page)
+                page = []
+                if done:
+                    break
+        if page:
+            await take(page)
+        if batch:
+            await flush(batch)
+    except PatternTimeout as e:
+        result.aborted = str(e)
+        if batch:
+            await flush(batch)
+    finally:
+        old_queue.put_nowait(None)
+        await lane
+        await check.close()
+    return result
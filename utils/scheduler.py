@@ -0,0 +1,222 @@
+# utils/scheduler.py (persistent timed punishments: unmute/unban on expiry)
+import asyncio
+import heapq
+import json
+import sqlite3
+import time
+import traceback
+
+
+class PunishmentScheduler:
+    """One dispatcher task driving every pending timed punishment.
+
+    Entries are keyed by (kind, guild_id, user_id), persisted to SQLite and
+    rehydrated on start. In memory each pending entry is just a heap tuple
+    plus a dict slot, so tens of thousands cost a few MB instead of a
+    suspended command coroutine each. Due entries are handled in batches by
+    the handler registered for their kind. A row is only deleted once its
+    handler succeeds; failures are retried with exponential backoff up to
+    max_attempts, then logged and dropped.
+    """
+
+    def __init__(self, path, *, wait_ready=None, batch_size=50, max_attempts=5, retry_delay=30.0, max_retry_delay=3600.0):
+        self.path = path
+        self.wait_ready = wait_ready
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self._handlers = {}
+        self._entries = {}  # key -> (expires_at, data)
+        self._attempts = {}  # key -> failed dispatches so far (in memory only)
+        self._heap = []     # (expires_at, key); stale items skipped on pop
+        self._wake = asyncio.Event()
+        self._db = None
+        self._db_lock = asyncio.Lock()
+        self._task = None
+
+    def register(self, kind, handler):
+        # handler(guild_id, user_id, data) -> awaitable
+        self._handlers[kind] = handler
+
+    def __len__(self):
+        return len(self._entries)
+
+    # ---- storage ----
+    def _open(self):
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute(
+            "CREATE TABLE IF NOT EXISTS punishments ("
+            " kind TEXT NOT NULL, guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL,"
+            " expires_at REAL NOT NULL, data TEXT,"
+            " PRIMARY KEY (kind, guild_id, user_id))"
+        )
+        db.commit()
+        rows = db.execute("SELECT kind, guild_id, user_id, expires_at, data FROM punishments").fetchall()
+        return db, rows
+
+    async def _write(self, sql, params, many=False):
+        async with self._db_lock:
+            def run():
+                if many:
+                    self._db.executemany(sql, params)
+                else:
+                    self._db.execute(sql, params)
+                self._db.commit()
+            await asyncio.to_thread(run)
+
+    # ---- lifecycle ----
+    async def start(self):
+        self._db, rows = await asyncio.to_thread(self._open)
+        for kind, guild_id, user_id, expires_at, data in rows:
+            self._push((kind, guild_id, user_id), expires_at, json.loads(data) if data else None)
+        if rows:
+            print(f"⏰ Rehydrated {len(rows)} pending timed punishment(s).")
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._db:
+            async with self._db_lock:
+                await asyncio.to_thread(self._db.close)
+            self._db = None
+
+    # ---- public API ----
+    def _push(self, key, expires_at, data):
+        self._entries[key] = (expires_at, data)
+        heapq.heappush(self._heap, (expires_at, key))
+        if self._heap[0][1] == key:
+            self._wake.set()
+
+    async def schedule(self, kind, guild_id, user_id, expires_at, data=None):
+        key = (kind, guild_id, user_id)
+        await self._write(
+            "INSERT OR REPLACE INTO punishments VALUES (?, ?, ?, ?, ?)",
+            (kind, guild_id, user_id, expires_at, json.dumps(data) if data is not None else None),
+        )
+        self._push(key, expires_at, data)
+
+    async def schedule_many(self, kind, entries):
+        # entries: iterable of (guild_id, user_id, expires_at, data); one transaction
+        entries = list(entries)
+        if not entries:
+            return
+        await self._write(
+            "INSERT OR REPLACE INTO punishments VALUES (?, ?, ?, ?, ?)",
+            [(kind, g, u, exp, json.dumps(data) if data is not None else None) for g, u, exp, data in entries],
+            many=True,
+        )
+        for guild_id, user_id, expires_at, data in entries:
+            self._push((kind, guild_id, user_id), expires_at, data)
+
+    async def cancel(self, kind, guild_id, user_id):
+        key = (kind, guild_id, user_id)
+        self._attempts.pop(key, None)
+        if self._entries.pop(key, None) is None:
+            return False
+        await self._write("DELETE FROM punishments WHERE kind=? AND guild_id=? AND user_id=?", key)
+        return True
+
+    async def cancel_many(self, kind, targets):
+        # targets: iterable of (guild_id, user_id); one transaction, returns how many were pending
+        keys = []
+        for guild_id, user_id in targets:
+            key = (kind, guild_id, user_id)
+            self._attempts.pop(key, None)
+            if self._entries.pop(key, None) is not None:
+                keys.append(key)
+        if keys:
+            await self._write("DELETE FROM punishments WHERE kind=? AND guild_id=? AND user_id=?", keys, many=True)
+        return len(keys)
+
+    def pending(self, kind, guild_id, user_id):
+        entry = self._entries.get((kind, guild_id, user_id))
+        return entry[0] if entry else None
+
+    # ---- dispatcher ----
+    def _pop_due(self, now):
+        due = []
+        while self._heap and self._heap[0][0] <= now and len(due) < self.batch_size:
+            expires_at, key = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != expires_at:
+                continue  # cancelled or rescheduled
+            del self._entries[key]
+            due.append((key, expires_at, entry[1]))
+        return due
+
+    async def _dispatch(self, key, data):
+        # True when the entry is finished with (handled or unhandleable), False to retry
+        kind, guild_id, user_id = key
+        handler = self._handlers.get(kind)
+        if handler is None:
+            print(f"⚠️ No handler registered for timed punishment {kind!r}; dropping.")
+            return True
+        try:
+            await handler(guild_id, user_id, data)
+            return True
+        except Exception:
+            print(f"❌ Timed {kind} failed for user {user_id} in guild {guild_id}:")
+            print(traceback.format_exc(), flush=True)
+            return False
+
+    def _settle(self, due, results):
+        # split a dispatched batch into rows to delete and rows to push back
+        done, retry = [], []
+        for (key, expires_at, data), ok in zip(due, results):
+            kind, guild_id, user_id = key
+            if ok:
+                self._attempts.pop(key, None)
+                done.append((*key, expires_at))
+                continue
+            if key in self._entries:
+                # re-scheduled while the handler ran; the new entry wins
+                self._attempts.pop(key, None)
+                continue
+            attempts = self._attempts.get(key, 0) + 1
+            if attempts >= self.max_attempts:
+                self._attempts.pop(key, None)
+                print(f"❌ Giving up on timed {kind} for user {user_id} in guild {guild_id} after {attempts} attempt(s).", flush=True)
+                done.append((*key, expires_at))
+                continue
+            self._attempts[key] = attempts
+            delay = min(self.retry_delay * 2 ** (attempts - 1), self.max_retry_delay)
+            retry_at = time.time() + delay
+            print(f"🔁 Retrying timed {kind} for user {user_id} in guild {guild_id} in {delay:.0f}s (attempt {attempts + 1}/{self.max_attempts}).", flush=True)
+            retry.append((retry_at, *key, expires_at))
+            self._push(key, retry_at, data)
+        return done, retry
+
+    async def _run(self):
+        if self.wait_ready is not None:
+            await self.wait_ready()
+        while True:
+            self._wake.clear()
+            due = self._pop_due(time.time())
+            if due:
+                results = await asyncio.gather(*(self._dispatch(key, data) for key, _, data in due))
+                done, retry = self._settle(due, results)
+                # match on expires_at so an entry re-scheduled meanwhile survives
+                if done:
+                    await self._write(
+                        "DELETE FROM punishments WHERE kind=? AND guild_id=? AND user_id=? AND expires_at=?",
+                        done, many=True,
+                    )
+                if retry:
+                    await self._write(
+                        "UPDATE punishments SET expires_at=? WHERE kind=? AND guild_id=? AND user_id=? AND expires_at=?",
+                        retry, many=True,
+                    )
+                continue
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
@@ -0,0 +1,115 @@
+# utils/sqlitestore.py (SQLite in WAL mode behind a single queued writer task)
+import asyncio
+import sqlite3
+import threading
+
+
+class QueuedSQLiteStore:
+    """Base for stores whose writes go through one writer task.
+
+    Writes are queued with `_enqueue`; the writer drains whatever has piled
+    up (up to `batch_size`) and hands it to `_apply` in a worker thread, so a
+    burst is one transaction and one fsync. Reads use a second connection
+    behind a lock via `_read`. Subclasses set SCHEMA and `label` and
+    implement `_apply`.
+    """
+
+    SCHEMA = ()
+    label = "SQLite store"  # used in log lines
+
+    def __init__(self, path, *, batch_size=500):
+        self.path = path
+        self.batch_size = batch_size
+        self._queue = asyncio.Queue()
+        self._writer = None
+        self._reader = None
+        self._read_lock = threading.Lock()
+        self._task = None
+
+    def _connect(self):
+        db = sqlite3.connect(self.path, check_same_thread=False)
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def _open(self):
+        writer = self._connect()
+        for stmt in self.SCHEMA:
+            writer.execute(stmt)
+        writer.commit()
+        return writer, self._connect()
+
+    async def start(self):
+        self._writer, self._reader = await asyncio.to_thread(self._open)
+        self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task:
+            await self.flush()
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self._closing()
+        for db in (self._writer, self._reader):
+            if db is not None:
+                await asyncio.to_thread(db.close)
+        self._writer = self._reader = None
+
+    async def _closing(self):
+        # hook: runs after the last write, before the connections close
+        pass
+
+    # ---- writes (queued) ----
+    def _enqueue(self, item, *, wait=False):
+        """Queue `item` for `_apply`. With wait=True, returns a future for
+        the value `_apply` returned for it."""
+        fut = asyncio.get_running_loop().create_future() if wait else None
+        self._queue.put_nowait((item, fut))
+        return fut
+
+    async def flush(self):
+        await self._queue.join()
+
+    def _apply(self, items):
+        """Write `items` in one transaction (runs in a worker thread) and
+        return one result per item."""
+        raise NotImplementedError
+
+    def _written(self, items):
+        # hook: runs on the loop after each batch, whether or not it committed
+        pass
+
+    async def _run(self):
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self.batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            items = [item for item, _ in batch]
+            try:
+                results = await asyncio.to_thread(self._apply, items)
+                for (_, fut), value in zip(batch, results):
+                    if fut is not None and not fut.done():
+                        fut.set_result(value)
+            except Exception as e:
+                print(f"❌ {self.label} write failed:", repr(e), flush=True)
+                for _, fut in batch:
+                    if fut is not None and not fut.done():
+                        fut.set_exception(e)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            self._written(items)
+
+    # ---- reads ----
+    def _read_sync(self, func, args):
+        with self._read_lock:
+            return func(self._reader, *args)
+
+    async def _read(self, func, *args):
+        """Run `func(reader_connection, *args)` in a thread once queued writes
+        have landed."""
+        await self.flush()
+        return await asyncio.to_thread(self._read_sync, func, args)
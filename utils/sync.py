@@ -0,0 +1,73 @@
+# utils/sync.py (only push the app-command tree to Discord when it changed)
+import asyncio
+import hashlib
+import json
+import os
+
+from utils.config import data_path
+
+
+def _digest(obj):
+    return hashlib.sha256(json.dumps(obj, sort_keys=True, separators=(",", ":")).encode()).hexdigest()
+
+
+def command_payload(tree, guild=None):
+    # exactly what tree.sync() would upload for this scope, keyed per command
+    payload = {}
+    for cmd in tree.get_commands(guild=guild):
+        data = cmd.to_dict(tree)
+        payload[f"{data.get('type', 1)}:{data['name']}"] = data
+    return payload
+
+
+def _load_state(path):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_state(path, state):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def diff_commands(old, new):
+    # old/new: {key: hash}; returns (added, removed, changed) command names
+    name = lambda key: key.split(":", 1)[1]
+    added = sorted(name(k) for k in new.keys() - old.keys())
+    removed = sorted(name(k) for k in old.keys() - new.keys())
+    changed = sorted(name(k) for k in new.keys() & old.keys() if new[k] != old[k])
+    return added, removed, changed
+
+
+async def sync_if_changed(bot, guild=None, *, state_path=None, force=False):
+    """Sync the tree for one scope if its hash differs from the last sync.
+
+    The last-synced hash per scope ("global" or "guild:<id>") is kept in
+    data/command_sync.json. Returns the list of synced commands, or None
+    when the sync was skipped.
+    """
+    state_path = state_path or data_path("command_sync.json")
+    scope = f"guild:{guild.id}" if guild is not None else "global"
+
+    payload = command_payload(bot.tree, guild=guild)
+    per_command = {key: _digest(data) for key, data in payload.items()}
+    tree_hash = _digest(per_command)
+
+    state = await asyncio.to_thread(_load_state, state_path)
+    previous = state.get(scope, {})
+    if not force and previous.get("hash") == tree_hash:
+        print(f"✅ Command tree for {scope} unchanged ({tree_hash[:12]}); skipping sync.", flush=True)
+        return None
+
+    added, removed, changed = diff_commands(previous.get("commands", {}), per_command)
+    print(f"🔄 Command tree for {scope} changed: added={added} removed={removed} changed={changed}", flush=True)
+
+    synced = await bot.tree.sync(guild=guild)
+    state[scope] = {"hash": tree_hash, "commands": per_command}
+    await asyncio.to_thread(_save_state, state_path, state)
+    return synced
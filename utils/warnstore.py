@@ -0,0 +1,75 @@
+# utils/warnstore.py (warning ledger: SQLite in WAL mode behind a single writer task)
+import time
+
+from utils.sqlitestore import QueuedSQLiteStore
+
+SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS warnings ("
+    " id INTEGER PRIMARY KEY,"
+    " guild_id INTEGER NOT NULL, user_id INTEGER NOT NULL, moderator_id INTEGER NOT NULL,"
+    " reason TEXT NOT NULL, created_at REAL NOT NULL)",
+    "CREATE INDEX IF NOT EXISTS warnings_member ON warnings (guild_id, user_id, created_at)",
+)
+
+
+class WarningStore(QueuedSQLiteStore):
+    """Per-member warning history.
+
+    `add` only enqueues; one writer task drains the queue and commits
+    whatever has piled up in a single transaction, so a burst of warns is
+    one fsync rather than one per warn. Reads use their own connection and
+    the (guild_id, user_id, created_at) index.
+    """
+
+    SCHEMA = SCHEMA
+    label = "Warning store"
+
+    # ---- writes (queued) ----
+    def add(self, guild_id, user_id, moderator_id, reason):
+        self._enqueue(("add", (guild_id, user_id, moderator_id, reason, time.time())))
+
+    async def clear(self, guild_id, user_id):
+        return await self._enqueue(("clear", (guild_id, user_id)), wait=True)
+
+    def _apply(self, ops):
+        results = []
+        cur = self._writer.cursor()
+        adds = []
+        for op, params in ops:
+            if op == "add":
+                adds.append(params)
+                results.append(None)
+                continue
+            # keep ordering: a clear must see the adds queued before it
+            if adds:
+                cur.executemany(
+                    "INSERT INTO warnings (guild_id, user_id, moderator_id, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+                    adds,
+                )
+                adds = []
+            cur.execute("DELETE FROM warnings WHERE guild_id=? AND user_id=?", params)
+            results.append(cur.rowcount)
+        if adds:
+            cur.executemany(
+                "INSERT INTO warnings (guild_id, user_id, moderator_id, reason, created_at) VALUES (?, ?, ?, ?, ?)",
+                adds,
+            )
+        self._writer.commit()
+        return results
+
+    # ---- reads ----
+    @staticmethod
+    def _history_sync(db, guild_id, user_id, limit):
+        count = db.execute(
+            "SELECT COUNT(*) FROM warnings WHERE guild_id=? AND user_id=?", (guild_id, user_id)
+        ).fetchone()[0]
+        rows = db.execute(
+            "SELECT moderator_id, reason, created_at FROM warnings"
+            " WHERE guild_id=? AND user_id=? ORDER BY created_at DESC LIMIT ?",
+            (guild_id, user_id, limit),
+        ).fetchall()
+        return count, rows
+
+    async def history(self, guild_id, user_id, limit=10):
+        """(total count, newest `limit` rows of (moderator_id, reason, created_at))."""
+        return await self._read(self._history_sync, guild_id, user_id, limit)
@@ -0,0 +1,142 @@
+# utils/watchdog.py (event-loop lag measurement + blocking-call watchdog)
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+
+class LoopLagMonitor:
+    """Measures how late the event loop runs a timer scheduled `interval` ahead.
+
+    `lag` is the most recent delay, `max_lag` the worst seen in the last
+    `window` samples.
+    """
+
+    def __init__(self, interval=0.5, window=120):
+        self.interval = interval
+        self.lag = 0.0
+        self._samples = deque(maxlen=window)
+        self._task = None
+
+    @property
+    def max_lag(self):
+        return max(self._samples, default=0.0)
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.lag = max(0.0, time.perf_counter() - expected)
+            self._samples.append(self.lag)
+            self._tick(self.lag)
+
+    def _tick(self, lag):
+        pass
+
+
+class StallReport:
+    __slots__ = ("at", "blocked_for", "duration", "cog", "command", "location", "stack")
+
+    def __init__(self, at, blocked_for, cog, command, location, stack):
+        self.at = at
+        self.blocked_for = blocked_for  # how long the loop had been stuck when sampled
+        self.duration = None            # total stall, filled in once the loop resumes
+        self.cog = cog
+        self.command = command
+        self.location = location
+        self.stack = stack
+
+
+class LoopWatchdog(LoopLagMonitor):
+    """Lag monitor plus a sampler thread that catches the loop while it is stuck.
+
+    The loop task stamps a heartbeat every `interval`. A daemon thread checks
+    the stamp; once it is older than `threshold` it grabs the loop thread's
+    current stack (sys._current_frames) and attributes it to the innermost
+    frame inside `cogs/`. Reports go into a ring buffer of `keep` entries.
+    The thread only reads a float while the loop is healthy.
+    """
+
+    def __init__(self, bot=None, *, interval=0.1, threshold=0.25, keep=50, window=300):
+        super().__init__(interval=interval, window=window)
+        self.bot = bot
+        self.threshold = threshold
+        self.reports = deque(maxlen=keep)
+        self.last_beat = time.perf_counter()
+        self._open = None
+        self._loop_thread = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        super().start()
+        if self._thread is None:
+            self._loop_thread = threading.get_ident()
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._thread.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+        await super().stop()
+
+    def _tick(self, lag):
+        self.last_beat = time.perf_counter()
+        report = self._open
+        if report is not None:
+            report.duration = lag
+            self._open = None
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            stuck = time.perf_counter() - self.last_beat - self.interval
+            if stuck < self.threshold or self._open is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            report = self._describe(frame, stuck)
+            self.reports.append(report)
+            self._open = report
+
+    def _describe(self, frame, stuck):
+        stack = traceback.extract_stack(frame)
+        cog = command = location = None
+        cogs_dir = os.sep + "cogs" + os.sep
+        for entry in reversed(stack):
+            if cogs_dir in entry.filename:
+                module = "cogs." + os.path.splitext(os.path.basename(entry.filename))[0]
+                cog = self._cog_for_module(module) or module
+                command = entry.name
+                location = f"{os.path.basename(entry.filename)}:{entry.lineno}"
+                break
+        if location is None and stack:
+            location = f"{os.path.basename(stack[-1].filename)}:{stack[-1].lineno}"
+        return StallReport(time.time(), stuck, cog, command, location, traceback.format_list(stack[-25:]))
+
+    def _cog_for_module(self, module):
+        if self.bot is None:
+            return None
+        for name, cog in list(self.bot.cogs.items()):
+            if type(cog).__module__ == module:
+                return name
+        return None